@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+"""Copyright 2019 Cisco Systems
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+"""Measures import time of the package and its lightweight helpers.
+Each measurement runs in a fresh interpreter. That lightweight imports
+do not load grpc or the generated protobufs is checked by
+tests/test_imports.py. Does not require a device.
+"""
+import subprocess
+import sys
+
+RUNS = 5
+STATEMENTS = (
+    "import nxos_grpc",
+    "import nxos_grpc.response",
+    "import nxos_grpc.xpath",
+    "from nxos_grpc import Client",
+)
+PROBE = """
+import time
+start = time.time()
+%s
+print(repr(time.time() - start))
+"""
+
+
+def measure(statement, runs=RUNS):
+    """Returns the best seconds importing statement, or raises
+    RuntimeError with the child's error output if the import failed.
+    """
+    best = None
+    for _ in range(runs):
+        child = subprocess.Popen(
+            [sys.executable, "-c", PROBE % statement],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        output, error = child.communicate()
+        if child.returncode:
+            raise RuntimeError(error.decode("utf-8", "replace").strip())
+        elapsed = float(output.decode("utf-8"))
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+if __name__ == "__main__":
+    failed = False
+    for statement in STATEMENTS:
+        try:
+            elapsed = measure(statement)
+        except RuntimeError as error:
+            failed = True
+            print("%-35s failed:\n%s" % (statement, error))
+            continue
+        print("%-35s %7.1f ms" % (statement, elapsed * 1000))
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+"""Copyright 2019 Cisco Systems
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+"""Measures resident memory of many small finalized gRPCResponses, and
+of retained wide interface replies decoded with and without
+InterningDecoder. Does not require a device.
+"""
+import collections
+import json
+import tracemalloc
+
+from nxos_grpc.interning import InterningDecoder, StringTable
+from nxos_grpc.response import build_response
+
+COUNT = 20000
+Reply = collections.namedtuple("Reply", ["ReqID", "YangData", "Errors"])
+PAYLOAD = '{"Cisco-NX-OS-device:System": {"name": "switch"}}'
+WIDE_RESPONSES = 10
+WIDE_INTERFACES = 500
+
+
+def wide_payload(interfaces=WIDE_INTERFACES):
+    """An If-list reply shaped like rmon counters of every interface."""
+    counters = dict(
+        ("%sPkts" % name, "0") for name in ("ucast", "multicast", "broadcast")
+    )
+    counters["octets"] = "0"
+    entries = []
+    for index in range(interfaces):
+        entries.append(
+            {
+                "id": "eth1/%i" % (index + 1),
+                "adminSt": "up",
+                "operSt": "up" if index % 2 else "down",
+                "mode": "trunk",
+                "layer": "Layer2",
+                "mtu": "9216",
+                "rmonIfIn-items": dict(counters, errors="0", discards="0"),
+                "rmonIfOut-items": dict(counters, errors="0", discards="0"),
+                "dot3Stats-items": {"lateCollisions": "0", "carrierSenseErrors": "0"},
+            }
+        )
+    return json.dumps(
+        {"System": {"intf-items": {"phys-items": {"PhysIf-list": entries}}}}
+    )
+
+
+def measure(count=COUNT):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    responses = [build_response(0, [Reply(0, PAYLOAD, "")]) for _ in range(count)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    total = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    return responses, total
+
+
+def measure_wide(decoder=None, count=WIDE_RESPONSES):
+    """Retains count decoded wide replies, as a poller's consumer might."""
+    payload = wide_payload()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    responses = [
+        build_response(0, [Reply(0, payload, "")], decoder=decoder)
+        for _ in range(count)
+    ]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    total = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    return responses, total
+
+
+if __name__ == "__main__":
+    _, total = measure()
+    print(
+        "%i responses: %.1f KiB total, %.0f bytes per response"
+        % (COUNT, total / 1024.0, float(total) / COUNT)
+    )
+    for label, decoder in (
+        ("json", None),
+        ("interned keys", InterningDecoder(max_value_length=0, table=StringTable())),
+        ("interned keys and values", InterningDecoder(table=StringTable())),
+    ):
+        _, total = measure_wide(decoder)
+        print(
+            "%i wide responses, %s: %.1f KiB total"
+            % (WIDE_RESPONSES, label, total / 1024.0)
+        )
@@ -12,4 +12,37 @@ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 See the License for the specific language governing permissions and
 limitations under the License.
 """
-from .client import Client
+"""Public classes are imported on first access, so that importing the
+package, or helpers such as nxos_grpc.response and nxos_grpc.xpath,
+does not load grpc and the generated protobuf modules.
+"""
+import importlib
+import sys
+
+_LAZY = {
+    "Client": ".client",
+    "Poller": ".poller",
+    "DeltaTracker": ".delta",
+    "CounterRates": ".rates",
+    "Fleet": ".fleet",
+}
+
+__all__ = sorted(_LAZY)
+
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+    value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
+
+
+if sys.version_info < (3, 7):
+    # Module __getattr__ is unsupported, import eagerly.
+    for _name in _LAZY:
+        __getattr__(_name)
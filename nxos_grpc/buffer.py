@@ -0,0 +1,124 @@
+"""Copyright 2019 Cisco Systems
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+"""Chunk buffer which spills to disk past a size threshold.
+Large responses are held as UTF-8 in an anonymous temporary file
+instead of as Python str chunks, and read back through mmap so the
+payload is paged in by the OS rather than copied into the heap.
+"""
+import mmap
+
+
+class SpillBuffer(object):
+    """Accumulates str chunks, spilling to a temporary file once the
+    buffered size exceeds threshold characters.
+
+    Attributes
+    ----------
+    threshold : uint
+        Characters to buffer in memory before spilling. None never spills.
+    spilled : bool
+        Whether data is held on disk.
+    """
+
+    __slots__ = ("threshold", "spilled", "__chunks", "__size", "__file", "__mmap")
+
+    def __init__(self, threshold=None):
+        self.threshold = threshold
+        self.spilled = False
+        self.__chunks = []
+        self.__size = 0
+        self.__file = None
+        self.__mmap = None
+
+    def __len__(self):
+        """Buffered size, in characters until spilled and bytes after."""
+        return self.__size
+
+    def __bool__(self):
+        return self.__size > 0
+
+    __nonzero__ = __bool__
+
+    def append(self, chunk):
+        if not chunk:
+            return
+        if self.spilled:
+            self.__file.write(chunk.encode("utf-8"))
+            self.__size = self.__file.tell()
+            return
+        self.__chunks.append(chunk)
+        self.__size += len(chunk)
+        if self.threshold is not None and self.__size > self.threshold:
+            self.__spill()
+
+    def __spill(self):
+        # Deferred, tempfile is comparatively slow to import.
+        import tempfile
+
+        self.__file = tempfile.TemporaryFile(prefix="nxos_grpc-")
+        for chunk in self.__chunks:
+            self.__file.write(chunk.encode("utf-8"))
+        self.__chunks = []
+        self.__size = self.__file.tell()
+        self.spilled = True
+
+    def view(self):
+        """Returns a read-only buffer over the data: a memoryview of an
+        mmap when spilled, otherwise of the encoded bytes.
+        """
+        if not self.spilled:
+            return memoryview(self.getbytes())
+        if self.__mmap is None or len(self.__mmap) != self.__size:
+            self.__file.flush()
+            self.__mmap = mmap.mmap(
+                self.__file.fileno(), self.__size, access=mmap.ACCESS_READ
+            )
+        return memoryview(self.__mmap)
+
+    def getbytes(self):
+        """Returns the data as UTF-8 bytes, a copy of the spill file when
+        spilled. Prefer view() or getvalue() for large data.
+        """
+        if not self.spilled:
+            return "".join(self.__chunks).encode("utf-8")
+        self.__file.flush()
+        self.__file.seek(0)
+        return self.__file.read()
+
+    def getvalue(self):
+        """Returns the data as str, decoded straight from the mmap when
+        spilled rather than through an intermediate bytes copy.
+        """
+        if not self.spilled:
+            return "".join(self.__chunks)
+        view = self.view()
+        try:
+            return str(view, "utf-8")
+        finally:
+            # Unexported, the mmap may be closed.
+            view.release()
+
+    def close(self):
+        """Releases the temporary file, if any."""
+        if self.__mmap is not None:
+            try:
+                self.__mmap.close()
+            except BufferError:
+                # Views are still exported, the mmap is released with them.
+                pass
+            self.__mmap = None
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
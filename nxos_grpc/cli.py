@@ -0,0 +1,304 @@
+"""Copyright 2019 Cisco Systems
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+"""nxos-grpc command line tool.
+Issues one request per target and path across an inventory of devices
+in parallel, subject to per-device rate limits, retrying transient
+failures, and streams replies to stdout as NDJSON. Failures are logged
+to stderr and reflected in the exit status.
+
+Examples
+--------
+$ nxos-grpc -i switches.txt -u admin get-oper \\
+    'Cisco-NX-OS-device:System/intf-items/phys-items/PhysIf-list[id=eth1/1]'
+$ nxos-grpc -t 10.0.0.1 -t 10.0.0.2 -u admin edit-config -f change.json
+"""
+import argparse
+import getpass
+import io
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_NAMESPACE = "http://cisco.com/ns/yang/cisco-nx-os-device"
+PASSWORD_ENV = "NXOS_GRPC_PASSWORD"
+
+"""gRPC status codes worth retrying, the device or network being busy."""
+RETRY_CODES = frozenset(["UNAVAILABLE", "DEADLINE_EXCEEDED", "RESOURCE_EXHAUSTED"])
+
+"""gRPC status codes worth retrying config edits on. Past a deadline the
+device may already have applied the change, which a retry would apply
+again or, for create, fail on.
+"""
+EDIT_RETRY_CODES = frozenset(["UNAVAILABLE"])
+
+
+def read_inventory(path):
+    """Reads an inventory file of one device per line.
+
+    Each line is a target host[:port], optionally followed by a username
+    and password separated by whitespace. Blank lines and lines starting
+    with # are ignored.
+
+    Returns
+    -------
+    list of tuple
+        (target, username, password), with None for absent fields.
+    """
+    devices = []
+    with io.open(path, encoding="utf-8") as inventory:
+        for line in inventory:
+            fields = line.split()
+            if not fields or fields[0].startswith("#"):
+                continue
+            if len(fields) > 3:
+                raise ValueError("Invalid inventory line %r!" % line.strip())
+            fields += [None] * (3 - len(fields))
+            devices.append(tuple(fields))
+    return devices
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="nxos-grpc",
+        description="Query or configure many NX-OS devices over gRPC, "
+        "writing replies as NDJSON.",
+    )
+    devices = parser.add_argument_group("devices")
+    devices.add_argument(
+        "-i", "--inventory", help="File of targets, one per line, see read_inventory."
+    )
+    devices.add_argument(
+        "-t",
+        "--target",
+        action="append",
+        default=[],
+        help="Target host[:port]. May be repeated.",
+    )
+    devices.add_argument("-u", "--username", help="Default username.")
+    devices.add_argument(
+        "-p",
+        "--password",
+        help="Default password. Defaults to $%s, else prompted." % PASSWORD_ENV,
+    )
+    devices.add_argument("--tls-pem", help="PEM file enabling TLS.")
+    devices.add_argument("--tls-server-override", help="TLS server name.")
+    control = parser.add_argument_group("request control")
+    control.add_argument(
+        "-j",
+        "--parallel",
+        type=int,
+        default=64,
+        help="Requests in flight across all devices. Default %(default)s.",
+    )
+    control.add_argument(
+        "--rate",
+        type=float,
+        help="Maximum requests per second to each device.",
+    )
+    control.add_argument(
+        "--max-in-flight",
+        type=int,
+        default=1,
+        help="Maximum concurrent requests to each device. Default %(default)s.",
+    )
+    control.add_argument(
+        "--timeout",
+        type=int,
+        default=60,
+        help="Seconds before a request is abandoned. Default %(default)s.",
+    )
+    control.add_argument(
+        "--retries",
+        type=int,
+        default=2,
+        help="Retries of transient failures, only of UNAVAILABLE for "
+        "edit-config. Default %(default)s.",
+    )
+    control.add_argument(
+        "--backoff",
+        type=float,
+        default=1.0,
+        help="Seconds before the first retry, doubling after. Default %(default)s.",
+    )
+    output = parser.add_argument_group("output")
+    output.add_argument("-o", "--output", help="File to append to. Default stdout.")
+    output.add_argument(
+        "--compress", action="store_true", help="gzip compress the output file."
+    )
+    output.add_argument("-v", "--verbose", action="store_true")
+    commands = parser.add_subparsers(dest="command", metavar="command")
+    commands.required = True
+    for command, help_text in (
+        ("get", "Get oper and config data."),
+        ("get-oper", "Get only oper data."),
+        ("get-config", "Get only config data."),
+    ):
+        subparser = commands.add_parser(command, help=help_text)
+        subparser.add_argument("xpath", nargs="+", help="YANG XPath to request.")
+        subparser.add_argument(
+            "-n",
+            "--namespace",
+            default=DEFAULT_NAMESPACE,
+            help="YANG namespace. Default %(default)s.",
+        )
+        if command == "get-config":
+            subparser.add_argument("--source", default="running", choices=("running",))
+    edit = commands.add_parser("edit-config", help="Edit running config.")
+    edit.add_argument(
+        "-f", "--file", required=True, help="JSON YANG payload, - for stdin."
+    )
+    edit.add_argument(
+        "--operation",
+        default="merge",
+        choices=("merge", "create", "replace", "delete", "remove"),
+    )
+    edit.add_argument(
+        "--default-operation", default="merge", choices=("merge", "replace", "none")
+    )
+    edit.add_argument(
+        "--error-operation",
+        default="roll-back",
+        choices=("roll-back", "stop", "continue"),
+    )
+    return parser
+
+
+def _requests(args):
+    """Returns [(Client method, payload, path recorded in output, kwargs)]."""
+    if args.command == "edit-config":
+        if args.file == "-":
+            payload = sys.stdin.read()
+        else:
+            with io.open(args.file, encoding="utf-8") as payload_file:
+                payload = payload_file.read()
+        kwargs = {
+            "operation": args.operation,
+            "default_operation": args.default_operation,
+            "error_operation": args.error_operation,
+        }
+        return [("edit_config", payload, args.file, kwargs)]
+    method = args.command.replace("-", "_")
+    kwargs = {"namespace": args.namespace}
+    if args.command == "get-config":
+        kwargs["source"] = args.source
+    return [(method, xpath, xpath, kwargs) for xpath in args.xpath]
+
+
+def _clients(args, devices):
+    from .client import Client
+    from .limits import RateLimiter
+
+    clients = []
+    for target, username, password in devices:
+        rates = {"*": (args.rate, max(args.rate, 1))} if args.rate else None
+        clients.append(
+            Client(
+                target,
+                username or args.username,
+                password or args.password,
+                timeout=args.timeout,
+                credentials=args.tls_pem,
+                credentials_from_file=args.tls_pem is not None,
+                tls_server_override=args.tls_server_override,
+                limiter=RateLimiter(max_in_flight=args.max_in_flight, rates=rates),
+            )
+        )
+    return clients
+
+
+def _run(client, method, payload, path, kwargs, sink, retries, backoff):
+    """Issues one request with retries. Returns whether it succeeded."""
+    import grpc
+
+    retry_codes = EDIT_RETRY_CODES if method == "edit_config" else RETRY_CODES
+    attempt = 0
+    while True:
+        try:
+            response = getattr(client, method)(payload, **kwargs)
+        except grpc.RpcError as error:
+            code = error.code()
+            if attempt < retries and getattr(code, "name", code) in retry_codes:
+                time.sleep(backoff * 2**attempt)
+                attempt += 1
+                continue
+            logging.error("%s %s: %s %s", client.target, path, code, error.details())
+            return False
+        except Exception:  # pylint: disable=broad-except
+            logging.exception("%s %s: request failed!", client.target, path)
+            return False
+        sink.write(response, target=client.target, path=path)
+        if response.errors:
+            logging.warning("%s %s: device returned errors.", client.target, path)
+            return False
+        return True
+
+
+def main(argv=None):
+    """Console entry point. Returns the exit status."""
+    from .sinks import NDJSONSink
+
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format="%(levelname)s %(message)s",
+        stream=sys.stderr,
+    )
+    devices = [(target, None, None) for target in args.target]
+    if args.inventory:
+        devices.extend(read_inventory(args.inventory))
+    if not devices:
+        logging.error("No targets, specify --inventory or --target.")
+        return 2
+    if args.password is None:
+        args.password = os.environ.get(PASSWORD_ENV)
+    if args.password is None and any(device[2] is None for device in devices):
+        args.password = getpass.getpass()
+    requests = _requests(args)
+    clients = _clients(args, devices)
+    start = time.time()
+    with NDJSONSink(args.output or sys.stdout, compress=args.compress) as sink:
+        with ThreadPoolExecutor(max_workers=max(args.parallel, 1)) as executor:
+            futures = [
+                executor.submit(
+                    _run,
+                    client,
+                    method,
+                    payload,
+                    path,
+                    kwargs,
+                    sink,
+                    args.retries,
+                    args.backoff,
+                )
+                for client in clients
+                for method, payload, path, kwargs in requests
+            ]
+            failed = sum(1 for future in futures if not future.result())
+    for client in clients:
+        client.close()
+    logging.info(
+        "%i requests to %i devices in %.2fs, %i failed.",
+        len(futures),
+        len(clients),
+        time.time() - start,
+        failed,
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
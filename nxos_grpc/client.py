@@ -18,8 +18,11 @@ TODO: Write session state management wrapper.
 TODO: Make individual returns more useful?
 TODO: Exception classes.
 """
+import collections
 import logging
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 try:
     # Python 3
@@ -28,7 +31,14 @@ except ImportError:
     # Python 2
     from urlparse import urlparse
 import grpc
-from .response import build_response
+from .exceptions import RPCError
+from .health import BreakerRegistry
+from .inflight import InFlightRequest, InFlightTable, RequestIDAllocator
+from .limits import LimiterRegistry
+from .projection import Projection
+from .response import ResponseStream, build_response
+from .tree import is_list
+from .xpath import compile_xpath, merge_xpaths, parse_xpath, select_xpath
 from . import proto
 
 
@@ -38,11 +48,23 @@ class Client(object):
     Returns relatively raw response data. Response data may be accessed
     via the ReqID, YangData, and Errors attributes/items.
 
+    A Client may be shared between threads. All requests are multiplexed
+    over the one underlying channel, and the submit_* methods return
+    concurrent.futures.Future objects, assembling responses on a thread
+    pool owned by the Client.
+
     Attributes
     ----------
     username : str
     password : str
     timeout : uint
+    spill_threshold : uint
+    decoder : object
+    limiter : RateLimiter
+    breaker : CircuitBreaker
+    recorder : Recorder
+    cancel_on_error : bool
+    raise_on_error : bool
 
     Methods
     -------
@@ -52,6 +74,10 @@ class Client(object):
         Get only config data.
     get_oper(...)
         Get only oper data.
+    get_many(...)
+        Get several XPaths in a single request.
+    stream(...)
+        Get as a cancellable stream of reply chunks.
     edit_config(...)
         Edit running config.
     start_session(...)
@@ -60,6 +86,29 @@ class Client(object):
         Gracefully close stateful session.
     kill_session(...)
         Forcefully terminate stateful session.
+    connect(...)
+        Establish the channel ahead of the first request.
+    connect_future()
+        Start establishing the channel, returning a Future.
+    in_flight()
+        Outstanding requests and their progress.
+    cancel_slowest(...)
+        Cancel the oldest outstanding requests.
+    submit(...)
+        Run any of the above asynchronously, returning a Future.
+    submit_get(...), submit_get_config(...), submit_get_oper(...)
+        Asynchronous variants returning Futures.
+    close()
+        Shut down the thread pool and channel. Required to release the
+        channel when a breaker is configured.
+
+    Raises
+    ------
+    CircuitOpenError
+        From any request while the target is considered down, if a
+        breaker is configured.
+    RPCError
+        From get requests answered with Errors, if raise_on_error.
 
     Examples
     --------
@@ -84,6 +133,9 @@ class Client(object):
     """
     __C_MAX_LONG = 2147483647
 
+    """RPCs which reply with a stream of chunks."""
+    __STREAMING_RPCS = frozenset(["GetOper", "Get", "GetConfig"])
+
     def __init__(
         self,
         target,
@@ -93,6 +145,15 @@ class Client(object):
         credentials=None,
         credentials_from_file=False,
         tls_server_override=None,
+        spill_threshold=None,
+        max_workers=None,
+        decoder=None,
+        limiter=None,
+        breaker=None,
+        recorder=None,
+        channel=None,
+        cancel_on_error=False,
+        raise_on_error=False,
     ):
         """Initializes the gRPC client stub and defines authentication and timeout attributes.
 
@@ -111,16 +172,73 @@ class Client(object):
             Indicates that credentials is a file path.
         tls_server_override : str, optional
             TLS server name, if desired.
+        spill_threshold : uint, optional
+            Characters of response YangData to hold in memory before
+            spilling to a temporary file. Defaults to never spilling.
+        max_workers : uint, optional
+            Threads used by the submit_* methods. Defaults to the
+            concurrent.futures default.
+        decoder : object, optional
+            Object with a loads(payload) method used to decode response
+            YangData, e.g. offload.ProcessDecoder. Defaults to json.loads.
+        limiter : RateLimiter or LimiterRegistry, optional
+            Admission control for requests to this target. A registry
+            shares one RateLimiter between Clients of the same target.
+        breaker : CircuitBreaker or BreakerRegistry, optional
+            Health tracking for this target, failing requests fast while
+            it is considered down. A registry shares one CircuitBreaker
+            between Clients of the same target. The breaker is subscribed
+            to the channel's connectivity, which keeps a gRPC polling
+            thread and the channel alive until close(). Call close(), or
+            use the Client as a context manager, when a breaker is
+            configured.
+        recorder : Recorder, optional
+            Records GetOper, Get and GetConfig response streams,
+            see recording.Recorder.
+        channel : grpc.Channel, optional
+            Channel to use instead of creating one, e.g. a
+            recording.ReplayChannel. credentials, credentials_from_file and
+            tls_server_override are then ignored.
+        cancel_on_error : bool, optional
+            Cancel a streamed reply as soon as it carries Errors, rather
+            than reading the remaining YangData, see build_response.
+        raise_on_error : bool, optional
+            Fail fast, raising RPCError as soon as a streamed reply
+            carries Errors and cancelling the remainder.
         """
         self.username = username
         self.password = password
         self.timeout = int(timeout)
+        self.spill_threshold = spill_threshold
+        self.decoder = decoder
         self.__target = self.__gen_target(target)
         self.__credentials = self.__gen_credentials(credentials, credentials_from_file)
         self.__options = self.__gen_options(tls_server_override)
-        self.__client = self.__gen_client(
-            self.__target, self.__credentials, self.__options
-        )
+        if channel is None:
+            channel = self.__gen_channel(
+                self.__target, self.__credentials, self.__options
+            )
+        self.__channel = channel
+        self.__client = proto.gRPCConfigOperStub(self.__channel)
+        if isinstance(limiter, LimiterRegistry):
+            limiter = limiter.get(self.__target)
+        self.limiter = limiter
+        if isinstance(breaker, BreakerRegistry):
+            breaker = breaker.get(self.__target)
+        elif breaker is not None and breaker.target is None:
+            breaker.target = self.__target
+        self.breaker = breaker
+        if breaker is not None and hasattr(self.__channel, "subscribe"):
+            # Drives the breaker from connectivity changes until close().
+            self.__channel.subscribe(breaker.on_connectivity)
+        self.recorder = recorder
+        self.cancel_on_error = cancel_on_error
+        self.raise_on_error = raise_on_error
+        self.__next_req_id = RequestIDAllocator()
+        self.__in_flight = InFlightTable()
+        self.__max_workers = max_workers
+        self.__executor = None
+        self.__executor_lock = threading.Lock()
 
     def __repr__(self):
         """JSON dump a dict of basic attributes."""
@@ -134,110 +252,347 @@ class Client(object):
             }
         )
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def target(self):
+        """The host:port requests are issued against."""
+        return self.__target
+
+    def connect(self, timeout=None):
+        """Establishes the channel to the target ahead of the first
+        request, so that DNS, TCP, TLS and HTTP/2 setup are not paid by it.
+        A configured breaker is informed of the outcome.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            Maximum seconds to wait. Defaults to waiting indefinitely.
+
+        Returns
+        -------
+        bool
+            Whether the channel is ready.
+        """
+        future = self.connect_future()
+        try:
+            future.result(timeout=timeout)
+        except grpc.FutureTimeoutError:
+            # Cancelling stops the connectivity subscription.
+            future.cancel()
+            return False
+        return True
+
+    def connect_future(self):
+        """Starts establishing the channel without waiting, see connect.
+
+        Returns
+        -------
+        grpc.Future
+            Completes once the channel is ready. Cancel it to give up,
+            which a configured breaker records as a failed connection.
+        """
+        future = grpc.channel_ready_future(self.__channel)
+        if self.breaker is not None:
+            future.add_done_callback(self.__on_connect_done)
+        return future
+
+    def __on_connect_done(self, future):
+        if future.cancelled():
+            self.breaker.record_failure("connect timeout")
+        else:
+            self.breaker.on_connectivity(grpc.ChannelConnectivity.READY)
+
+    def in_flight(self):
+        """Returns outstanding requests, oldest first.
+
+        Returns
+        -------
+        list of InFlightRequest
+            Each with ReqID, RPC, path, start time and progress.
+        """
+        return self.__in_flight.snapshot()
+
+    def cancel_slowest(self, count=1, min_elapsed=0):
+        """Cancels up to count of the oldest outstanding streaming
+        requests, which raise a CANCELLED grpc.RpcError to their callers.
+
+        Parameters
+        ----------
+        count : uint, optional
+        min_elapsed : float, optional
+            Only cancel requests outstanding for at least this many seconds.
+
+        Returns
+        -------
+        list of InFlightRequest
+            The requests cancelled.
+        """
+        return self.__in_flight.cancel_slowest(count, min_elapsed)
+
+    def __projection(self, yang_path, fields, path_is_payload):
+        """Projection decoder for fields of the last list in yang_path."""
+        if not fields:
+            return None
+        list_names = []
+        if not path_is_payload:
+            elements = parse_xpath(yang_path)
+            list_names = [element.name for element in elements if is_list(element.name)]
+        if not list_names:
+            raise ValueError("fields requires an XPath locating a list!")
+        return Projection(
+            list_names[-1],
+            fields,
+            object_pairs_hook=getattr(self.decoder, "convert", None),
+        )
+
+    def __req_id(self, request_id):
+        """request_id, or the next allocated ID if None."""
+        return self.__next_req_id() if request_id is None else request_id
+
     def __gen_metadata(self):
         """Generates expected gRPC call metadata."""
         return [("username", self.username), ("password", self.password)]
 
-    def __fulfill_request(self, request_method, request_args):
+    def __fulfill_request(
+        self, rpc_name, request_args, decode=True, sink=None, decoder=None
+    ):
         """Generically executes a gRPC RPC "request".
         All requests follow the same control flow, thus generalization.
 
         Parameters
         ----------
-        request_method : def
-            Method to execute.
+        rpc_name : str
+            Name of the RPC to execute, e.g. GetOper.
         request_args : object
             Arguments to RPC method to execute.
+        decode : bool, optional
+            Parse the response JSON, see build_response.
+        sink : file-like, optional
+            Stream YangData to sink, see build_response.
+        decoder : object, optional
+            Overrides the Client's decoder for this request.
 
         Returns
         -------
         gRPCResponse
             Response wrapper object with ReqID, YangData, and Errors fields.
         """
-        return build_response(
+        in_flight, response_stream = self.__start_request(rpc_name, request_args)
+        try:
+            response = build_response(
+                request_args.ReqID,
+                response_stream,
+                decode=decode,
+                sink=sink,
+                spill_threshold=self.spill_threshold,
+                decoder=decoder or self.decoder,
+                cancel_on_error=self.cancel_on_error,
+                raise_on_error=self.raise_on_error,
+            )
+        except BaseException as error:
+            self.__end_request(in_flight, error)
+            raise
+        self.__end_request(in_flight)
+        return response
+
+    def __start_request(self, rpc_name, request_args):
+        """Admits and issues a request. __end_request must follow.
+
+        Returns
+        -------
+        (InFlightRequest, response stream)
+        """
+        if self.breaker is not None:
+            self.breaker.before_call()
+        if self.limiter is not None:
+            self.limiter.acquire(rpc_name)
+        streaming = rpc_name in self.__STREAMING_RPCS
+        in_flight = InFlightRequest(
             request_args.ReqID,
-            request_method(
-                request_args, timeout=self.timeout, metadata=self.__gen_metadata()
-            ),
+            rpc_name,
+            getattr(request_args, "YangPath", None),
+            streaming,
         )
-
-    def get_oper(self, yang_path, namespace=None, request_id=0, path_is_payload=False):
+        self.__in_flight.add(in_flight)
+        try:
+            request_method = getattr(self.__client, rpc_name)
+            response_stream = request_method(
+                request_args, timeout=self.timeout, metadata=self.__gen_metadata()
+            )
+            if streaming:
+                response_stream = in_flight.attach(response_stream)
+            if self.recorder is not None:
+                response_stream = self.recorder.wrap(
+                    rpc_name, self.__target, request_args, response_stream
+                )
+        except BaseException as error:
+            self.__end_request(in_flight, error)
+            raise
+        return in_flight, response_stream
+
+    def __end_request(self, in_flight, error=None):
+        """Releases a request, recording its outcome with the breaker."""
+        self.__in_flight.remove(in_flight)
+        if self.limiter is not None:
+            self.limiter.release()
+        if self.breaker is None:
+            return
+        if isinstance(error, grpc.RpcError):
+            self.breaker.record_error(error.code())
+        elif error is None or isinstance(error, RPCError):
+            # The device answered, even if with errors.
+            self.breaker.record_success()
+
+    def get_oper(
+        self,
+        yang_path,
+        namespace=None,
+        request_id=None,
+        path_is_payload=False,
+        decode=True,
+        sink=None,
+        fields=None,
+    ):
         """Get operational data from device.
 
         Parameters
         ----------
         yang_path : str
-            YANG XPath which locates the datapoints.
+            YANG XPath which locates the datapoints. List entries may be
+            selected with key predicates, e.g. If-list[id=eth1/1].
         namespace : str, optional
             YANG namespace applicable to the specified XPath.
         request_id : uint, optional
             The request ID to indicate to the device.
+            Defaults to the next ID allocated by the Client.
         path_is_payload : bool, optional
             Indicates that the yang_path parameter contains a preformed JSON
             payload and should not be parsed into JSON as an XPath.
+        decode : bool, optional
+            Parse the returned JSON. If False the response is left
+            unfinalized with raw data available via yang_data_bytes().
+        sink : file-like, optional
+            Write YangData to sink as it is received without parsing.
+        fields : list of str, optional
+            Leaves or subtrees to keep of each entry of the last list in
+            yang_path, e.g. ['id', 'rmonIfIn-items/ucastPkts'].
+            See projection.Projection.
 
         Returns
         -------
         gRPCResponse
             Response wrapper object with ReqID, YangData, and Errors fields.
         """
+        decoder = self.__projection(yang_path, fields, path_is_payload)
         if not path_is_payload:
-            yang_path = self.__parse_xpath_to_json(yang_path, namespace)
-        request_args = proto.GetOperArgs(ReqID=request_id, YangPath=yang_path)
+            yang_path = compile_xpath(yang_path, namespace)
+        request_args = proto.GetOperArgs(
+            ReqID=self.__req_id(request_id), YangPath=yang_path
+        )
         return self.__fulfill_request(
-            request_method=self.__client.GetOper, request_args=request_args
+            rpc_name="GetOper",
+            request_args=request_args,
+            decode=decode,
+            sink=sink,
+            decoder=decoder,
         )
 
-    def get(self, yang_path, namespace=None, request_id=0, path_is_payload=False):
+    def get(
+        self,
+        yang_path,
+        namespace=None,
+        request_id=None,
+        path_is_payload=False,
+        decode=True,
+        sink=None,
+        fields=None,
+    ):
         """Get configuration and operational data from device.
 
         Parameters
         ----------
         yang_path : str
-            YANG XPath which locates the datapoints.
+            YANG XPath which locates the datapoints. List entries may be
+            selected with key predicates, e.g. If-list[id=eth1/1].
         namespace : str, optional
             YANG namespace applicable to the specified XPath.
         request_id : uint, optional
             The request ID to indicate to the device.
+            Defaults to the next ID allocated by the Client.
         path_is_payload : bool, optional
             Indicates that the yang_path parameter contains a preformed JSON
             payload and should not be parsed into JSON as an XPath.
+        decode : bool, optional
+            Parse the returned JSON. If False the response is left
+            unfinalized with raw data available via yang_data_bytes().
+        sink : file-like, optional
+            Write YangData to sink as it is received without parsing.
+        fields : list of str, optional
+            Leaves or subtrees to keep of each entry of the last list in
+            yang_path, e.g. ['id', 'rmonIfIn-items/ucastPkts'].
+            See projection.Projection.
 
         Returns
         -------
         gRPCResponse
             Response wrapper object with ReqID, YangData, and Errors fields.
         """
+        decoder = self.__projection(yang_path, fields, path_is_payload)
         if not path_is_payload:
-            yang_path = self.__parse_xpath_to_json(yang_path, namespace)
-        request_args = proto.GetArgs(ReqID=request_id, YangPath=yang_path)
+            yang_path = compile_xpath(yang_path, namespace)
+        request_args = proto.GetArgs(
+            ReqID=self.__req_id(request_id), YangPath=yang_path
+        )
         return self.__fulfill_request(
-            request_method=self.__client.Get, request_args=request_args
+            rpc_name="Get",
+            request_args=request_args,
+            decode=decode,
+            sink=sink,
+            decoder=decoder,
         )
 
     def get_config(
         self,
         yang_path,
         namespace=None,
-        request_id=0,
+        request_id=None,
         source="running",
         path_is_payload=False,
+        decode=True,
+        sink=None,
+        fields=None,
     ):
         """Get configuration data from device.
 
         Parameters
         ----------
         yang_path : str
-            YANG XPath which locates the datapoints.
+            YANG XPath which locates the datapoints. List entries may be
+            selected with key predicates, e.g. If-list[id=eth1/1].
         namespace : str, optional
             YANG namespace applicable to the specified XPath.
         request_id : uint, optional
             The request ID to indicate to the device.
+            Defaults to the next ID allocated by the Client.
         source : { 'running', ? }, optional
             Source to retrieve configuration from.
         path_is_payload : bool, optional
             Indicates that the yang_path parameter contains a preformed JSON
             payload and should not be parsed into JSON as an XPath.
+        decode : bool, optional
+            Parse the returned JSON. If False the response is left
+            unfinalized with raw data available via yang_data_bytes().
+        sink : file-like, optional
+            Write YangData to sink as it is received without parsing.
+        fields : list of str, optional
+            Leaves or subtrees to keep of each entry of the last list in
+            yang_path, e.g. ['id', 'rmonIfIn-items/ucastPkts'].
+            See projection.Projection.
 
         Returns
         -------
@@ -249,13 +604,115 @@ class Client(object):
         Need to verify whether source param may be something other than running.
         """
         self.__validate_enum_arg(source, {"running"})
+        decoder = self.__projection(yang_path, fields, path_is_payload)
         if not path_is_payload:
-            yang_path = self.__parse_xpath_to_json(yang_path, namespace)
+            yang_path = compile_xpath(yang_path, namespace)
         request_args = proto.GetConfigArgs(
-            ReqID=request_id, Source=source, YangPath=yang_path
+            ReqID=self.__req_id(request_id), Source=source, YangPath=yang_path
         )
         return self.__fulfill_request(
-            request_method=self.__client.GetConfig, request_args=request_args
+            rpc_name="GetConfig",
+            request_args=request_args,
+            decode=decode,
+            sink=sink,
+            decoder=decoder,
+        )
+
+    def get_many(
+        self, yang_paths, namespace=None, request_id=None, operation="get_oper"
+    ):
+        """Get several XPaths in a single request.
+        The XPaths are merged into one request tree, and the reply split
+        back into one response per XPath.
+
+        Parameters
+        ----------
+        yang_paths : list of str
+            YANG XPaths which locate the datapoints.
+        namespace : str
+            YANG namespace applicable to the specified XPaths.
+        request_id : uint, optional
+            The request ID to indicate to the device.
+            Defaults to the next ID allocated by the Client.
+        operation : { 'get_oper', 'get', 'get_config' }, optional
+            Request method to issue.
+
+        Returns
+        -------
+        collections.OrderedDict
+            XPath to gRPCResponse, each with YangData shaped as if the XPath
+            had been requested alone. YangData is None if absent from the
+            reply. All share the ReqID and Errors of the single request.
+        """
+        self.__validate_enum_arg(operation, {"get_oper", "get", "get_config"})
+        request_method = getattr(self, operation)
+        response = request_method(
+            merge_xpaths(yang_paths, namespace),
+            request_id=request_id,
+            path_is_payload=True,
+        )
+        return collections.OrderedDict(
+            (yang_path, response.derive(select_xpath(response.yang_data, yang_path)))
+            for yang_path in yang_paths
+        )
+
+    def stream(
+        self,
+        yang_path,
+        namespace=None,
+        operation="get_oper",
+        request_id=None,
+        source="running",
+        path_is_payload=False,
+    ):
+        """Issues a get request, returning the reply as a stream of chunks
+        which may be abandoned early, cancelling the call.
+
+        Parameters
+        ----------
+        yang_path : str
+            YANG XPath which locates the datapoints.
+        namespace : str, optional
+            YANG namespace applicable to the specified XPath.
+        operation : { 'get_oper', 'get', 'get_config' }, optional
+            Request method to issue.
+        request_id : uint, optional
+            The request ID to indicate to the device.
+            Defaults to the next ID allocated by the Client.
+        source : { 'running' }, optional
+            Source to retrieve configuration from, for get_config.
+        path_is_payload : bool, optional
+            Indicates that the yang_path parameter contains a preformed JSON
+            payload and should not be parsed into JSON as an XPath.
+
+        Returns
+        -------
+        ResponseStream
+            Iterable of reply chunks with cancel(). Should be closed, or
+            used as a context manager, if not iterated to the end.
+        """
+        self.__validate_enum_arg(operation, {"get_oper", "get", "get_config"})
+        if not path_is_payload:
+            yang_path = compile_xpath(yang_path, namespace)
+        request_id = self.__req_id(request_id)
+        if operation == "get_oper":
+            rpc_name = "GetOper"
+            request_args = proto.GetOperArgs(ReqID=request_id, YangPath=yang_path)
+        elif operation == "get":
+            rpc_name = "Get"
+            request_args = proto.GetArgs(ReqID=request_id, YangPath=yang_path)
+        else:
+            self.__validate_enum_arg(source, {"running"})
+            rpc_name = "GetConfig"
+            request_args = proto.GetConfigArgs(
+                ReqID=request_id, Source=source, YangPath=yang_path
+            )
+        in_flight, response_stream = self.__start_request(rpc_name, request_args)
+        return ResponseStream(
+            request_id,
+            response_stream,
+            on_close=lambda error: self.__end_request(in_flight, error),
+            cancel_on_error=self.cancel_on_error,
         )
 
     def edit_config(
@@ -264,7 +721,7 @@ class Client(object):
         operation="merge",
         default_operation="merge",
         session_id=0,
-        request_id=0,
+        request_id=None,
         target="running",
         error_operation="roll-back",
     ):
@@ -283,6 +740,7 @@ class Client(object):
             0 indicates stateless operation.
         request_id : uint, optional
             The request ID to indicate to the device.
+            Defaults to the next ID allocated by the Client.
         target : { 'running' }, optional
             Target datastore. Only 'running' is supported.
         error_operation : { 'roll-back', 'stop', 'continue' }, optional
@@ -303,34 +761,33 @@ class Client(object):
             YangPath=yang_path,
             Operation=operation,
             SessionID=session_id,
-            ReqID=request_id,
+            ReqID=self.__req_id(request_id),
             Target=target,
             DefOp=default_operation,
             ErrorOp=error_operation,
         )
-        return self.__fulfill_request(
-            request_method=self.__client.EditConfig, request_args=request_args
-        )
+        return self.__fulfill_request(rpc_name="EditConfig", request_args=request_args)
 
-    def start_session(self, request_id=0):
+    def start_session(self, request_id=None):
         """Starts a new session acquiring a session ID.
 
         Parameters
         ----------
         request_id : uint, optional
             The request ID to indicate to the device.
+            Defaults to the next ID allocated by the Client.
 
         Returns
         -------
         gRPCResponse
             Response wrapper object with ReqID, YangData, and Errors fields.
         """
-        request_args = proto.SessionArgs(ReqID=request_id)
+        request_args = proto.SessionArgs(ReqID=self.__req_id(request_id))
         return self.__fulfill_request(
-            request_method=self.__client.StartSession, request_args=request_args
+            rpc_name="StartSession", request_args=request_args
         )
 
-    def close_session(self, session_id, request_id=0):
+    def close_session(self, session_id, request_id=None):
         """Requests graceful termination of a session.
 
         Parameters
@@ -339,18 +796,21 @@ class Client(object):
             Unique session ID acquired from starting a session.
         request_id : uint, optional
             The request ID to indicate to the device.
+            Defaults to the next ID allocated by the Client.
 
         Returns
         -------
         gRPCResponse
             Response wrapper object with ReqID, YangData, and Errors fields.
         """
-        request_args = proto.CloseSessionArgs(ReqID=request_id, SessionID=session_id)
+        request_args = proto.CloseSessionArgs(
+            ReqID=self.__req_id(request_id), SessionID=session_id
+        )
         return self.__fulfill_request(
-            request_method=self.__client.CloseSession, request_args=request_args
+            rpc_name="CloseSession", request_args=request_args
         )
 
-    def kill_session(self, session_id, session_id_to_kill, request_id=0):
+    def kill_session(self, session_id, session_id_to_kill, request_id=None):
         """Forces the closing of a session.
 
         Parameters
@@ -361,6 +821,7 @@ class Client(object):
             Unique session ID to kill.
         request_id : uint, optional
             The request ID to indicate to the device.
+            Defaults to the next ID allocated by the Client.
 
         Returns
         -------
@@ -372,11 +833,62 @@ class Client(object):
         Not verified on whether we need to open a new session to kill a session.
         """
         request_args = proto.KillArgs(
-            ReqID=request_id, SessionID=session_id, SessionIDToKill=session_id_to_kill
-        )
-        return self.__fulfill_request(
-            request_method=self.__client.KillSession, request_args=request_args
+            ReqID=self.__req_id(request_id),
+            SessionID=session_id,
+            SessionIDToKill=session_id_to_kill,
         )
+        return self.__fulfill_request(rpc_name="KillSession", request_args=request_args)
+
+    def submit(self, method, *args, **kwargs):
+        """Run a request method asynchronously on the Client's thread pool.
+
+        Parameters
+        ----------
+        method : str
+            Name of the request method, e.g. 'get_oper'.
+        *args, **kwargs
+            Arguments to the request method.
+
+        Returns
+        -------
+        concurrent.futures.Future
+            Resolves to the method's return value.
+        """
+        return self.__get_executor().submit(getattr(self, method), *args, **kwargs)
+
+    def submit_get_oper(self, *args, **kwargs):
+        """get_oper returning a Future, see get_oper for arguments."""
+        return self.submit("get_oper", *args, **kwargs)
+
+    def submit_get(self, *args, **kwargs):
+        """get returning a Future, see get for arguments."""
+        return self.submit("get", *args, **kwargs)
+
+    def submit_get_config(self, *args, **kwargs):
+        """get_config returning a Future, see get_config for arguments."""
+        return self.submit("get_config", *args, **kwargs)
+
+    def close(self, wait=True):
+        """Shut down the thread pool and close the channel.
+
+        Parameters
+        ----------
+        wait : bool, optional
+            Wait for submitted requests to complete first.
+        """
+        with self.__executor_lock:
+            executor, self.__executor = self.__executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+        if self.breaker is not None and hasattr(self.__channel, "unsubscribe"):
+            self.__channel.unsubscribe(self.breaker.on_connectivity)
+        self.__channel.close()
+
+    def __get_executor(self):
+        with self.__executor_lock:
+            if self.__executor is None:
+                self.__executor = ThreadPoolExecutor(max_workers=self.__max_workers)
+            return self.__executor
 
     @staticmethod
     def __gen_target(target, netloc_prefix="//", default_port=50051):
@@ -401,19 +913,12 @@ class Client(object):
         return target_netloc
 
     @staticmethod
-    def __gen_client(target, credentials=None, options=None):
-        """Instantiates and returns the NX-OS gRPC client stub
-        over an insecure or secure channel.
-        """
-        client = None
+    def __gen_channel(target, credentials=None, options=None):
+        """Instantiates and returns an insecure or secure channel."""
         if not credentials:
-            insecure_channel = grpc.insecure_channel(target)
-            client = proto.gRPCConfigOperStub(insecure_channel)
-        else:
-            channel_creds = grpc.ssl_channel_credentials(credentials)
-            secure_channel = grpc.secure_channel(target, channel_creds, options)
-            client = proto.gRPCConfigOperStub(secure_channel)
-        return client
+            return grpc.insecure_channel(target)
+        channel_creds = grpc.ssl_channel_credentials(credentials)
+        return grpc.secure_channel(target, channel_creds, options)
 
     @staticmethod
     def __gen_credentials(credentials, credentials_from_file):
@@ -437,25 +942,6 @@ class Client(object):
             options.append(("grpc.ssl_target_name_override", tls_server_override))
         return tuple(options)
 
-    @staticmethod
-    def __parse_xpath_to_json(xpath, namespace):
-        """Parses an XPath to JSON representation, and appends
-        namespace into the JSON request.
-        """
-        if not namespace:
-            raise ValueError("Must include namespace if constructing from xpath!")
-        xpath_dict = {}
-        xpath_split = xpath.split("/")
-        first = True
-        for element in reversed(xpath_split):
-            if first:
-                xpath_dict[element] = {}
-                first = False
-            else:
-                xpath_dict = {element: xpath_dict}
-        xpath_dict["namespace"] = namespace
-        return json.dumps(xpath_dict)
-
     @staticmethod
     def __validate_enum_arg(name, valid_options, message=None):
         """Construct error around enumeration validation."""
@@ -0,0 +1,279 @@
+"""Copyright 2019 Cisco Systems
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+"""Flattens a YANG list into columns, one per leaf.
+Integer leaves become array('q'), or array('Q') beyond the int64 range,
+paired with a validity mask when values are missing. Other numeric
+leaves become array('d') with NaN for missing values, and everything
+else is dictionary encoded. NumPy, pandas and pyarrow conversions are optional and
+only imported when used; install with the columnar extra.
+"""
+import array
+import collections
+import re
+
+from .tree import find_lists, is_list
+
+"""Dictionary encoded column.
+codes is an array('i') of indexes into categories, -1 when missing.
+"""
+DictionaryColumn = collections.namedtuple("DictionaryColumn", ["codes", "categories"])
+
+"""Integer column with missing values.
+values is an array('q') or array('Q'), holding 0 where missing, and
+mask an array('B') of 1 where missing.
+"""
+MaskedColumn = collections.namedtuple("MaskedColumn", ["values", "mask"])
+
+_MISSING = object()
+_INT64_MIN = -(1 << 63)
+_INT64_MAX = (1 << 63) - 1
+_UINT64_MAX = (1 << 64) - 1
+
+"""Strings converted to numbers. int() and float() alone also accept
+whitespace, leading zeros, exponents, nan and inf, which would type
+leaves such as "0001" or "inf" that are better left as strings.
+"""
+_INT_PATTERN = re.compile(r"-?(?:0|[1-9][0-9]*)\Z")
+_FLOAT_PATTERN = re.compile(r"-?(?:0|[1-9][0-9]*)\.[0-9]+\Z")
+
+
+def _flatten_entry(entry, fields, prefix=""):
+    """Collects leaf values of a list entry keyed by relative path.
+    Nested lists are not columnar and are skipped.
+    """
+    for name, value in entry.items():
+        path = prefix + name
+        if isinstance(value, dict):
+            if not is_list(name):
+                _flatten_entry(value, fields, path + "/")
+        elif not isinstance(value, list):
+            fields[path] = value
+
+
+def _parse_number(value, convert_strings):
+    """Returns value as int or float if numeric, otherwise None."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return value
+    if convert_strings and isinstance(value, str):
+        if _INT_PATTERN.match(value):
+            return int(value)
+        if _FLOAT_PATTERN.match(value):
+            return float(value)
+    return None
+
+
+def _build_column(values, convert_strings):
+    numbers = []
+    is_int = True
+    has_missing = False
+    for value in values:
+        if value is _MISSING or value is None:
+            has_missing = True
+            numbers.append(None)
+            continue
+        number = _parse_number(value, convert_strings)
+        if number is None:
+            return _dictionary_encode(values)
+        if isinstance(number, float):
+            is_int = False
+        numbers.append(number)
+    typecode = _int_typecode(numbers) if is_int else None
+    if typecode is not None:
+        if not has_missing:
+            return array.array(typecode, numbers)
+        return MaskedColumn(
+            array.array(
+                typecode, [0 if number is None else number for number in numbers]
+            ),
+            array.array("B", [number is None for number in numbers]),
+        )
+    nan = float("nan")
+    return array.array(
+        "d", [nan if number is None else float(number) for number in numbers]
+    )
+
+
+def _int_typecode(numbers):
+    """'q' if numbers fit int64, 'Q' if uint64, otherwise None."""
+    present = [number for number in numbers if number is not None]
+    if not present:
+        return "q"
+    low, high = min(present), max(present)
+    if low >= _INT64_MIN and high <= _INT64_MAX:
+        return "q"
+    if low >= 0 and high <= _UINT64_MAX:
+        return "Q"
+    return None
+
+
+def _dictionary_encode(values):
+    categories = []
+    lookup = {}
+    codes = array.array("i")
+    for value in values:
+        if value is _MISSING or value is None:
+            codes.append(-1)
+            continue
+        if not isinstance(value, str):
+            value = str(value)
+        code = lookup.get(value)
+        if code is None:
+            code = lookup[value] = len(categories)
+            categories.append(value)
+        codes.append(code)
+    return DictionaryColumn(codes, categories)
+
+
+def to_columns(yang_data, list_name, fields=None, convert_strings=True):
+    """Flattens every entry of list_name in yang_data into columns.
+
+    Parameters
+    ----------
+    yang_data : dict
+        Decoded YangData, e.g. gRPCResponse.YangData.
+    list_name : str
+        YANG list to flatten, e.g. If-list.
+    fields : list of str, optional
+        Leaf paths relative to the list entry to include, e.g.
+        ['id', 'rmonIfIn-items/ucastPkts']. Defaults to every leaf.
+    convert_strings : bool, optional
+        Type strings of decimal numbers, which NX-OS commonly returns
+        for counters.
+
+    Returns
+    -------
+    collections.OrderedDict
+        Column name to array, MaskedColumn or DictionaryColumn.
+    """
+    rows = []
+    names = collections.OrderedDict((field, None) for field in fields or ())
+    for entry in find_lists(yang_data, list_name):
+        if not isinstance(entry, dict):
+            continue
+        row = {}
+        _flatten_entry(entry, row)
+        rows.append(row)
+        if not fields:
+            for name in row:
+                names[name] = None
+    columns = collections.OrderedDict()
+    for name in names:
+        values = [row.get(name, _MISSING) for row in rows]
+        columns[name] = _build_column(values, convert_strings)
+    return columns
+
+
+def to_numpy(yang_data, list_name, fields=None, convert_strings=True):
+    """Flattens list_name to a dict of NumPy arrays.
+    Dictionary encoded columns become object arrays with None for
+    missing values, and masked integer columns numpy.ma masked arrays.
+    """
+    import numpy
+
+    arrays = collections.OrderedDict()
+    for name, column in to_columns(
+        yang_data, list_name, fields, convert_strings
+    ).items():
+        if isinstance(column, DictionaryColumn):
+            categories = numpy.array(column.categories + [None], dtype=object)
+            arrays[name] = categories[numpy.frombuffer(column.codes, dtype=numpy.intc)]
+        elif isinstance(column, MaskedColumn):
+            arrays[name] = numpy.ma.masked_array(
+                _numpy_array(numpy, column.values), _numpy_mask(numpy, column)
+            )
+        else:
+            arrays[name] = numpy.frombuffer(column, dtype=column.typecode)
+    return arrays
+
+
+def to_dataframe(yang_data, list_name, fields=None, convert_strings=True):
+    """Flattens list_name to a pandas DataFrame.
+    Dictionary encoded columns become pandas Categoricals, and masked
+    integer columns nullable Int64 or UInt64.
+    """
+    import numpy
+    import pandas
+
+    data = collections.OrderedDict()
+    for name, column in to_columns(
+        yang_data, list_name, fields, convert_strings
+    ).items():
+        if isinstance(column, DictionaryColumn):
+            data[name] = pandas.Categorical.from_codes(
+                numpy.frombuffer(column.codes, dtype=numpy.intc), column.categories
+            )
+        elif isinstance(column, MaskedColumn):
+            data[name] = pandas.arrays.IntegerArray(
+                _numpy_array(numpy, column.values), _numpy_mask(numpy, column)
+            )
+        else:
+            data[name] = numpy.frombuffer(column, dtype=column.typecode)
+    return pandas.DataFrame(data)
+
+
+def to_arrow(yang_data, list_name, fields=None, convert_strings=True):
+    """Flattens list_name to a pyarrow Table.
+    Dictionary encoded columns become DictionaryArrays.
+    """
+    import pyarrow
+
+    arrays = []
+    names = []
+    for name, column in to_columns(
+        yang_data, list_name, fields, convert_strings
+    ).items():
+        if isinstance(column, DictionaryColumn):
+            codes = pyarrow.array(
+                column.codes,
+                type=pyarrow.int32(),
+                mask=[code < 0 for code in column.codes],
+            )
+            arrays.append(
+                pyarrow.DictionaryArray.from_arrays(
+                    codes, pyarrow.array(column.categories, type=pyarrow.string())
+                )
+            )
+        elif isinstance(column, MaskedColumn):
+            arrays.append(
+                pyarrow.array(
+                    column.values,
+                    type=_arrow_int_type(pyarrow, column.values.typecode),
+                    mask=[bool(missing) for missing in column.mask],
+                )
+            )
+        elif column.typecode in ("q", "Q"):
+            arrays.append(
+                pyarrow.array(column, type=_arrow_int_type(pyarrow, column.typecode))
+            )
+        else:
+            arrays.append(
+                pyarrow.array(column, type=pyarrow.float64(), from_pandas=True)
+            )
+        names.append(name)
+    return pyarrow.Table.from_arrays(arrays, names=names)
+
+
+def _arrow_int_type(pyarrow, typecode):
+    return pyarrow.uint64() if typecode == "Q" else pyarrow.int64()
+
+
+def _numpy_array(numpy, column):
+    return numpy.frombuffer(column, dtype=column.typecode)
+
+
+def _numpy_mask(numpy, column):
+    return numpy.frombuffer(column.mask, dtype=numpy.uint8).astype(bool)
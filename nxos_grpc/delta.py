@@ -0,0 +1,217 @@
+"""Copyright 2019 Cisco Systems
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+"""Change detection between successive YangData snapshots.
+The previous decoded tree is kept per target and path, and compared to
+the next with native equality, descending only into branches which
+differ, so unchanged subtrees cost a single comparison. YANG list
+entries are matched by key rather than by position, unless their keys
+are ambiguous.
+"""
+import collections
+import threading
+
+from .tree import entry_key, format_entry, is_list, list_entries
+
+"""A single difference between snapshots.
+op is one of 'added', 'removed', or 'changed'. path is a tuple of
+element names, with list entries formatted as If-list[id=eth1/1].
+old is None when added, new is None when removed.
+"""
+Change = collections.namedtuple("Change", ["op", "path", "old", "new"])
+
+_MISSING = object()
+
+
+class DeltaTracker(object):
+    """Tracks the previous snapshot per (target, path) and emits changes.
+
+    Snapshots are the decoded trees passed to update(), kept as they are
+    rather than copied, so they must not be modified afterwards. Leaves
+    are compared with ==, so values Python considers equal, such as 1
+    and 1.0, are not reported as changed.
+
+    Examples
+    --------
+    >>> tracker = DeltaTracker()
+    >>> response = client.get_oper(path, namespace=namespace)
+    >>> for change in tracker.update(client_target, path, response.YangData):
+    ...     print(change.op, '/'.join(change.path), change.new)
+    """
+
+    def __init__(self, list_keys=None):
+        """
+        Parameters
+        ----------
+        list_keys : dict, optional
+            Mapping of list name to a tuple of key leaf names, e.g.
+            {'If-list': ('id',)}. Lists not present fall back to the
+            heuristics in tree.entry_key, and then to entry position.
+        """
+        self.list_keys = list_keys or {}
+        self.__snapshots = {}
+        self.__lock = threading.Lock()
+
+    def update(self, target, path, yang_data):
+        """Compares yang_data to the previous snapshot and stores it.
+
+        Parameters
+        ----------
+        target : str
+            Device identifier.
+        path : str
+            Request path identifier.
+        yang_data : dict
+            Decoded YangData, e.g. gRPCResponse.YangData.
+
+        Returns
+        -------
+        list of Change
+            Empty if unchanged. On the first snapshot for a key every
+            leaf is reported as added.
+        """
+        with self.__lock:
+            previous = self.__snapshots.get((target, path), _MISSING)
+            self.__snapshots[(target, path)] = yang_data
+        changes = []
+        if previous is _MISSING:
+            self.__emit("added", yang_data, (), changes)
+        else:
+            self.__compare(previous, yang_data, (), changes)
+        return changes
+
+    def forget(self, target, path=None):
+        """Drops stored snapshots for target, or a single path of target."""
+        with self.__lock:
+            for key in list(self.__snapshots):
+                if key[0] == target and (path is None or key[1] == path):
+                    del self.__snapshots[key]
+
+    def __key(self, name, entry):
+        if not isinstance(entry, dict):
+            return ()
+        return entry_key(entry, self.list_keys.get(name))
+
+    def __elements(self, name, entries):
+        """Returns the key of each list entry, or None for entries to be
+        matched by position: those without key leaves, and all entries
+        when some share a key, e.g. the same addr in different VRFs.
+        """
+        keys = [self.__key(name, entry) or None for entry in entries]
+        present = [key for key in keys if key is not None]
+        if len(set(present)) != len(present):
+            return [None] * len(keys)
+        return keys
+
+    @staticmethod
+    def __element(name, key, index):
+        if key is None:
+            return "%s[%i]" % (name, index)
+        return format_entry(name, key)
+
+    def __compare(self, previous, current, path, changes):
+        if previous == current:
+            return
+        if isinstance(previous, dict) and isinstance(current, dict):
+            for name, child in current.items():
+                if name not in previous:
+                    self.__emit_member("added", name, child, path, changes)
+                elif is_list(name) and isinstance(child, (dict, list)):
+                    self.__compare_entries(name, previous[name], child, path, changes)
+                else:
+                    self.__compare(previous[name], child, path + (name,), changes)
+            for name, child in previous.items():
+                if name not in current:
+                    self.__emit_member("removed", name, child, path, changes)
+        elif isinstance(previous, list) and isinstance(current, list):
+            for index, child in enumerate(current):
+                element = "[%i]" % index
+                if index < len(previous):
+                    self.__compare(previous[index], child, path + (element,), changes)
+                else:
+                    self.__emit("added", child, path + (element,), changes)
+            for index in range(len(current), len(previous)):
+                self.__emit(
+                    "removed", previous[index], path + ("[%i]" % index,), changes
+                )
+        else:
+            changes.append(Change("changed", path, previous, current))
+
+    def __compare_entries(self, name, previous, current, path, changes):
+        """Compares list entries, matched by key."""
+        if previous == current:
+            return
+        previous = list_entries(previous) if isinstance(previous, (dict, list)) else []
+        current = list_entries(current)
+        if len(previous) == len(current):
+            # Usually entries keep their order between snapshots, so only
+            # differing entries are keyed, and the rest cost an ==.
+            differing = [
+                index for index, entry in enumerate(current) if previous[index] != entry
+            ]
+            if all(
+                self.__key(name, previous[index]) == self.__key(name, current[index])
+                for index in differing
+            ):
+                keys = self.__elements(name, current)
+                for index in differing:
+                    element = self.__element(name, keys[index], index)
+                    self.__compare(
+                        previous[index], current[index], path + (element,), changes
+                    )
+                return
+        # Entries without a usable key are matched by position.
+        by_key = collections.OrderedDict(
+            (index if key is None else key, (index, entry))
+            for index, (key, entry) in enumerate(
+                zip(self.__elements(name, previous), previous)
+            )
+        )
+        keys = self.__elements(name, current)
+        for index, (key, entry) in enumerate(zip(keys, current)):
+            match = by_key.pop(index if key is None else key, None)
+            if match is not None and match[1] == entry:
+                continue
+            element = self.__element(name, key, index)
+            if match is not None:
+                self.__compare(match[1], entry, path + (element,), changes)
+            else:
+                self.__emit("added", entry, path + (element,), changes)
+        for key, (index, entry) in by_key.items():
+            element = self.__element(name, None if isinstance(key, int) else key, index)
+            self.__emit("removed", entry, path + (element,), changes)
+
+    def __emit_member(self, op, name, value, path, changes):
+        """Reports every leaf of the dict member name as added or removed."""
+        if is_list(name) and isinstance(value, (dict, list)):
+            entries = list_entries(value)
+            keys = self.__elements(name, entries)
+            for index, (key, entry) in enumerate(zip(keys, entries)):
+                element = self.__element(name, key, index)
+                self.__emit(op, entry, path + (element,), changes)
+        else:
+            self.__emit(op, value, path + (name,), changes)
+
+    def __emit(self, op, value, path, changes):
+        """Reports every leaf below value as added or removed."""
+        if isinstance(value, dict):
+            for name, child in value.items():
+                self.__emit_member(op, name, child, path, changes)
+        elif isinstance(value, list):
+            for index, child in enumerate(value):
+                self.__emit(op, child, path + ("[%i]" % index,), changes)
+        elif op == "added":
+            changes.append(Change(op, path, None, value))
+        else:
+            changes.append(Change(op, path, value, None))
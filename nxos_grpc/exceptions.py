@@ -0,0 +1,100 @@
+"""Copyright 2019 Cisco Systems
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+"""Exception classes raised by the library."""
+
+
+class NXOSError(Exception):
+    """Base class for errors raised by this library."""
+
+
+class RPCError(NXOSError):
+    """Errors returned by the device in reply to a request.
+
+    Attributes
+    ----------
+    req_id : int
+    tag : str
+        NX-OS error-tag, e.g. data-missing.
+    path : str
+        error-path, if any.
+    message : str
+        error-message, if any.
+    errors : dict
+        The parsed Errors in full.
+    """
+
+    def __init__(self, errors, req_id=None):
+        error = _first_error(errors) or {}
+        self.req_id = req_id
+        self.tag = error.get("error-tag")
+        self.path = error.get("error-path")
+        self.message = error.get("error-message")
+        self.errors = errors
+        super(RPCError, self).__init__(
+            "%s: %s (%s)" % (self.tag, self.message, self.path)
+            if error
+            else "Device returned errors: %s" % (errors,)
+        )
+
+
+def _first_error(errors):
+    """Finds the first rpc-error like dict within parsed Errors."""
+    pending = [errors]
+    while pending:
+        node = pending.pop(0)
+        if isinstance(node, dict):
+            if "error-tag" in node or "error-message" in node:
+                return node
+            pending.extend(node.values())
+        elif isinstance(node, list):
+            pending.extend(node)
+    return None
+
+
+class CircuitOpenError(NXOSError):
+    """Raised instead of issuing a request to a target considered down.
+
+    Attributes
+    ----------
+    target : str
+    retry_after : float
+        Seconds until a trial request will be allowed.
+    """
+
+    def __init__(self, target, retry_after):
+        super(CircuitOpenError, self).__init__(
+            "Circuit open for %s, retry in %.1fs." % (target, retry_after)
+        )
+        self.target = target
+        self.retry_after = retry_after
+
+
+class ReplayError(NXOSError):
+    """Raised by a replayed call, in place of the grpc.RpcError a real
+    call would have raised.
+
+    Attributes
+    ----------
+    rpc : str
+    status : str
+        gRPC status code name.
+    details : str
+    """
+
+    def __init__(self, rpc, status, details=None):
+        super(ReplayError, self).__init__("%s %s: %s" % (rpc, status, details))
+        self.rpc = rpc
+        self.status = status
+        self.details = details
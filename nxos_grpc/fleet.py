@@ -0,0 +1,106 @@
+"""Copyright 2019 Cisco Systems
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+"""Groups of Clients managed together.
+A new channel only connects when first used, so the first request to
+each device otherwise pays connection setup inline. Fleet.warm connects
+every device concurrently ahead of a poll cycle and reports which are
+ready, keeping first-request latency predictable.
+"""
+import collections
+import time
+
+"""Outcome of connecting to a single target. elapsed is in seconds."""
+Readiness = collections.namedtuple("Readiness", ["target", "ready", "elapsed"])
+
+
+class Fleet(object):
+    """A set of Clients, typically one per device.
+
+    Examples
+    --------
+    >>> fleet = Fleet([Client(host, 'demo', 'demo') for host in hosts])
+    >>> readiness = fleet.warm(timeout=5)
+    >>> [r.target for r in readiness.values() if not r.ready]
+    ['10.0.0.7:50051']
+    """
+
+    def __init__(self, clients):
+        """
+        Parameters
+        ----------
+        clients : iterable of Client
+        """
+        self.clients = list(clients)
+
+    def __iter__(self):
+        return iter(self.clients)
+
+    def __len__(self):
+        return len(self.clients)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def warm(self, timeout=None):
+        """Connects every Client concurrently, see Client.connect.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            Maximum seconds to wait for the whole fleet.
+            Defaults to waiting indefinitely.
+
+        Returns
+        -------
+        OrderedDict
+            Client target to Readiness, in Client order.
+        """
+        # Deferred, the package is importable without grpc. No thread is
+        # started per Client, the readiness futures are waited on in turn.
+        import grpc
+
+        start = time.time()
+        deadline = None if timeout is None else start + timeout
+        connected = {}
+        futures = []
+        for client in self.clients:
+            future = client.connect_future()
+            future.add_done_callback(
+                lambda future, target=client.target: connected.setdefault(
+                    target, time.time()
+                )
+            )
+            futures.append((client.target, future))
+        readiness = collections.OrderedDict()
+        for target, future in futures:
+            remaining = None if deadline is None else max(deadline - time.time(), 0)
+            try:
+                future.result(timeout=remaining)
+                ready = True
+            except grpc.FutureTimeoutError:
+                future.cancel()
+                ready = False
+            readiness[target] = Readiness(
+                target, ready, connected.get(target, time.time()) - start
+            )
+        return readiness
+
+    def close(self, wait=True):
+        """Closes every Client."""
+        for client in self.clients:
+            client.close(wait=wait)
@@ -0,0 +1,206 @@
+"""Copyright 2019 Cisco Systems
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+"""Per-target health tracking and circuit breaking.
+A CircuitBreaker opens after consecutive failed requests, or as soon
+as the channel reports the target unreachable, and then fails requests
+immediately instead of waiting out their timeout. After reset_timeout
+a single trial request is let through (half-open); its outcome closes
+or re-opens the circuit.
+"""
+import threading
+import time
+
+from .exceptions import CircuitOpenError
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+"""gRPC status codes which indicate the target, rather than the request,
+is at fault.
+"""
+DEFAULT_FAILURE_CODES = frozenset(["UNAVAILABLE", "DEADLINE_EXCEEDED"])
+
+"""Channel connectivity states which indicate the target is unreachable."""
+_DOWN_CONNECTIVITY = frozenset(["TRANSIENT_FAILURE", "SHUTDOWN"])
+
+
+def _name(value):
+    """Name of a gRPC enum member, tolerating plain strings."""
+    return getattr(value, "name", value)
+
+
+class CircuitBreaker(object):
+    """Health state and circuit breaker for one target. Thread-safe.
+    A Client subscribes its breaker to channel connectivity, holding a
+    gRPC polling thread and the channel until the Client is closed, so
+    close Clients configured with a breaker.
+
+    Examples
+    --------
+    >>> breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+    >>> with Client('127.0.0.1', 'demo', 'demo', breaker=breaker) as client:
+    ...     client.get_oper(path, namespace=namespace)
+    >>> breaker.health()
+    {'state': 'closed', ...}
+    """
+
+    def __init__(
+        self, failure_threshold=5, reset_timeout=30.0, failure_codes=None, target=None
+    ):
+        """
+        Parameters
+        ----------
+        failure_threshold : uint, optional
+            Consecutive failures which open the circuit.
+        reset_timeout : float, optional
+            Seconds an open circuit waits before allowing a trial request.
+        failure_codes : set of str, optional
+            gRPC status code names counted as failures.
+            Defaults to DEFAULT_FAILURE_CODES.
+        target : str, optional
+            Target name used in CircuitOpenError messages.
+        """
+        self.failure_threshold = int(failure_threshold)
+        self.reset_timeout = float(reset_timeout)
+        self.failure_codes = frozenset(failure_codes or DEFAULT_FAILURE_CODES)
+        self.target = target
+        self.__state = CLOSED
+        self.__failures = 0
+        self.__opened_at = None
+        self.__trial_started = None
+        self.__last_failure = None
+        self.__connectivity = None
+        self.__lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self.__lock:
+            return self.__current_state(time.time())
+
+    def __current_state(self, now):
+        if self.__state == OPEN and now - self.__opened_at >= self.reset_timeout:
+            self.__state = HALF_OPEN
+            self.__trial_started = None
+        return self.__state
+
+    def __open(self, now):
+        self.__state = OPEN
+        self.__opened_at = now
+        self.__trial_started = None
+
+    def before_call(self):
+        """Raises CircuitOpenError if a request should not be issued."""
+        with self.__lock:
+            now = time.time()
+            state = self.__current_state(now)
+            if state == CLOSED:
+                return
+            if state == HALF_OPEN and (
+                self.__trial_started is None
+                or now - self.__trial_started >= self.reset_timeout
+            ):
+                # A trial whose outcome was never recorded expires as well.
+                self.__trial_started = now
+                return
+            retry_after = (
+                max(self.__opened_at + self.reset_timeout - now, 0)
+                if state == OPEN
+                else 0
+            )
+            raise CircuitOpenError(self.target, retry_after)
+
+    def record_success(self):
+        with self.__lock:
+            self.__failures = 0
+            self.__state = CLOSED
+            self.__trial_started = None
+
+    def record_failure(self, reason=None):
+        with self.__lock:
+            now = time.time()
+            self.__failures += 1
+            self.__last_failure = (now, reason)
+            state = self.__current_state(now)
+            if state == HALF_OPEN or self.__failures >= self.failure_threshold:
+                self.__open(now)
+
+    def record_error(self, code):
+        """Records a failed request by gRPC status code. Codes not in
+        failure_codes mean the target responded, and count as success.
+        """
+        if _name(code) in self.failure_codes:
+            self.record_failure(_name(code))
+        else:
+            self.record_success()
+
+    def on_connectivity(self, connectivity):
+        """Records a channel connectivity state, see grpc.Channel.subscribe.
+        Client subscribes its breaker, and unsubscribes it on close(),
+        which must be called for the channel to be released.
+        """
+        connectivity = _name(connectivity)
+        with self.__lock:
+            self.__connectivity = connectivity
+            now = time.time()
+            state = self.__current_state(now)
+            if connectivity in _DOWN_CONNECTIVITY and state == CLOSED:
+                self.__last_failure = (now, connectivity)
+                self.__open(now)
+            elif connectivity == "READY" and state == OPEN:
+                # Reachable again, allow a trial request early.
+                self.__state = HALF_OPEN
+                self.__trial_started = None
+
+    def health(self):
+        """Returns a snapshot of the health state as a dict."""
+        with self.__lock:
+            return {
+                "target": self.target,
+                "state": self.__current_state(time.time()),
+                "consecutive_failures": self.__failures,
+                "last_failure": self.__last_failure,
+                "connectivity": self.__connectivity,
+            }
+
+
+class BreakerRegistry(object):
+    """Shares one CircuitBreaker per target between Clients."""
+
+    def __init__(self, **breaker_kwargs):
+        """
+        Parameters
+        ----------
+        **breaker_kwargs
+            Arguments for each CircuitBreaker created, see CircuitBreaker.
+        """
+        self.breaker_kwargs = breaker_kwargs
+        self.__breakers = {}
+        self.__lock = threading.Lock()
+
+    def get(self, target):
+        """Returns the CircuitBreaker for target, creating it if needed."""
+        with self.__lock:
+            if target not in self.__breakers:
+                self.__breakers[target] = CircuitBreaker(
+                    target=target, **self.breaker_kwargs
+                )
+            return self.__breakers[target]
+
+    def health(self):
+        """Returns health snapshots of every known target."""
+        with self.__lock:
+            breakers = list(self.__breakers.values())
+        return [breaker.health() for breaker in breakers]
@@ -0,0 +1,191 @@
+"""Copyright 2019 Cisco Systems
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+"""Request ID allocation and tracking of requests in flight.
+Each Client numbers its requests from a thread-safe counter so that
+concurrent requests can be told apart in device logs, and keeps a table
+of outstanding requests with their progress for debugging stalls and
+shedding load by cancelling the slowest.
+"""
+import threading
+import time
+
+"""The device's ReqID is an int64."""
+_MAX_REQ_ID = 2**63 - 1
+
+
+class RequestIDAllocator(object):
+    """Thread-safe, monotonically increasing request IDs, from 1."""
+
+    def __init__(self, start=1):
+        self.__next = start
+        self.__lock = threading.Lock()
+
+    def __call__(self):
+        with self.__lock:
+            req_id = self.__next
+            self.__next = req_id + 1 if req_id < _MAX_REQ_ID else 1
+        return req_id
+
+
+class InFlightRequest(object):
+    """An outstanding request. Iterates its response stream, counting
+    progress, once attached to the call.
+
+    Attributes
+    ----------
+    req_id : int
+    rpc : str
+        RPC name, e.g. GetOper.
+    path : str
+        Request YangPath.
+    started : float
+        Wall clock start time.
+    chunks : int
+        Response chunks received so far.
+    bytes : int
+        YangData and Errors received so far, in characters which are
+        bytes for ASCII payloads.
+    streaming : bool
+        Whether the RPC replies with a stream, only these can be cancelled.
+    cancelled : bool
+    """
+
+    __slots__ = (
+        "req_id",
+        "rpc",
+        "path",
+        "started",
+        "chunks",
+        "bytes",
+        "streaming",
+        "cancelled",
+        "__call",
+        "__iterator",
+    )
+
+    def __init__(self, req_id, rpc, path, streaming=True):
+        self.req_id = req_id
+        self.rpc = rpc
+        self.path = path
+        self.started = time.time()
+        self.chunks = 0
+        self.bytes = 0
+        self.streaming = streaming
+        self.cancelled = False
+        self.__call = None
+        self.__iterator = None
+
+    def __repr__(self):
+        return "<InFlightRequest %s ReqID=%s %.1fs %i bytes>" % (
+            self.rpc,
+            self.req_id,
+            self.elapsed,
+            self.bytes,
+        )
+
+    @property
+    def elapsed(self):
+        return time.time() - self.started
+
+    def attach(self, call):
+        """Tracks the response stream of call, returning the stream to
+        consume in its place.
+        """
+        self.__call = call
+        self.__iterator = iter(call)
+        if self.cancelled:
+            call.cancel()
+        return self
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        chunk = next(self.__iterator)
+        self.chunks += 1
+        self.bytes += len(chunk.YangData) + len(chunk.Errors)
+        return chunk
+
+    next = __next__
+
+    def cancel(self):
+        """Cancels the request. The consumer of the stream receives a
+        CANCELLED grpc.RpcError.
+        """
+        self.cancelled = True
+        if self.__call is not None:
+            return self.__call.cancel()
+        return True
+
+    def as_dict(self):
+        return {
+            "req_id": self.req_id,
+            "rpc": self.rpc,
+            "path": self.path,
+            "started": self.started,
+            "elapsed": self.elapsed,
+            "chunks": self.chunks,
+            "bytes": self.bytes,
+            "cancelled": self.cancelled,
+        }
+
+
+class InFlightTable(object):
+    """Outstanding requests of a Client. Thread-safe."""
+
+    def __init__(self):
+        self.__requests = set()
+        self.__lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.__requests)
+
+    def add(self, request):
+        with self.__lock:
+            self.__requests.add(request)
+
+    def remove(self, request):
+        with self.__lock:
+            self.__requests.discard(request)
+
+    def snapshot(self):
+        """Returns outstanding InFlightRequests, oldest first."""
+        with self.__lock:
+            requests = list(self.__requests)
+        return sorted(requests, key=lambda request: request.started)
+
+    def cancel_slowest(self, count=1, min_elapsed=0):
+        """Cancels up to count of the oldest outstanding streaming requests.
+
+        Parameters
+        ----------
+        count : uint, optional
+        min_elapsed : float, optional
+            Only cancel requests outstanding for at least this many seconds.
+
+        Returns
+        -------
+        list of InFlightRequest
+            The requests cancelled.
+        """
+        cancelled = []
+        for request in self.snapshot():
+            if len(cancelled) >= count or request.elapsed < min_elapsed:
+                break
+            if request.cancelled or not request.streaming:
+                continue
+            request.cancel()
+            cancelled.append(request)
+        return cancelled
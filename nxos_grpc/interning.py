@@ -0,0 +1,97 @@
+"""Copyright 2019 Cisco Systems
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+"""String sharing across decoded trees.
+The json module already shares repeated keys within one document, but
+each document decoded gets its own copies, and repeated leaf values
+such as "up" or "enabled" are never shared. InterningDecoder maps keys
+and short string values through a table shared between documents, so
+that responses held at the same time share one copy of each. See
+benchmarks/response_memory.py, where ten retained interface replies
+take about a quarter less memory.
+"""
+import json
+
+
+class StringTable(object):
+    """Bounded table of shared strings. Thread-safe, as it relies only
+    on atomic dict operations.
+    """
+
+    def __init__(self, max_size=1 << 20):
+        """
+        Parameters
+        ----------
+        max_size : uint, optional
+            Strings to hold, after which unknown strings are not added.
+        """
+        self.max_size = max_size
+        self.__strings = {}
+
+    def __len__(self):
+        return len(self.__strings)
+
+    def __call__(self, string):
+        """Returns the shared copy of string."""
+        shared = self.__strings.get(string)
+        if shared is not None:
+            return shared
+        if len(self.__strings) >= self.max_size:
+            return string
+        return self.__strings.setdefault(string, string)
+
+    def clear(self):
+        self.__strings.clear()
+
+
+"""Default table shared by all InterningDecoders."""
+SHARED_TABLE = StringTable()
+
+
+class InterningDecoder(object):
+    """JSON decoder sharing keys and short string values between
+    documents. May be passed as decoder to Client or build_response.
+
+    Examples
+    --------
+    >>> client = Client('127.0.0.1', 'demo', 'demo', decoder=InterningDecoder())
+    """
+
+    def __init__(self, max_value_length=32, table=None):
+        """
+        Parameters
+        ----------
+        max_value_length : uint, optional
+            Longest string value to share, 0 to share only keys. Longer
+            values, e.g. descriptions, rarely repeat.
+        table : StringTable, optional
+            Defaults to SHARED_TABLE.
+        """
+        self.max_value_length = max_value_length
+        self.table = table if table is not None else SHARED_TABLE
+
+    def convert(self, pairs):
+        """object_pairs_hook sharing keys and short string values."""
+        table = self.table
+        limit = self.max_value_length
+        obj = {}
+        for name, value in pairs:
+            if value.__class__ is str and len(value) <= limit:
+                value = table(value)
+            obj[table(name)] = value
+        return obj
+
+    def loads(self, payload):
+        """Decodes a JSON str or UTF-8 bytes payload."""
+        return json.loads(payload, strict=False, object_pairs_hook=self.convert)
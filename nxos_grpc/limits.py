@@ -0,0 +1,204 @@
+"""Copyright 2019 Cisco Systems
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+"""Per-device admission control for requests.
+The NX-OS gRPC agent degrades when hammered concurrently, so requests
+to a device may be limited by a token bucket per RPC type and a cap on
+requests in flight. Waiting requests are admitted in priority order,
+config changes ahead of reads by default.
+"""
+import contextlib
+import itertools
+import threading
+import time
+
+"""Lower values are admitted first."""
+DEFAULT_PRIORITIES = {
+    "EditConfig": 0,
+    "StartSession": 0,
+    "CloseSession": 0,
+    "KillSession": 0,
+    "GetConfig": 10,
+    "Get": 10,
+    "GetOper": 20,
+}
+DEFAULT_PRIORITY = 10
+
+
+class TokenBucket(object):
+    """Token bucket refilled at rate tokens per second up to burst."""
+
+    def __init__(self, rate, burst=None):
+        if rate <= 0:
+            raise ValueError("rate must be greater than 0!")
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(rate, 1))
+        self.__tokens = self.burst
+        self.__updated = time.time()
+
+    def __refill(self, now):
+        self.__tokens = min(
+            self.burst, self.__tokens + (now - self.__updated) * self.rate
+        )
+        self.__updated = now
+
+    def delay(self, now):
+        """Seconds until a token is available, 0 if one is now."""
+        self.__refill(now)
+        if self.__tokens >= 1:
+            return 0
+        return (1 - self.__tokens) / self.rate
+
+    def consume(self, now):
+        self.__refill(now)
+        self.__tokens -= 1
+
+
+class RateLimiter(object):
+    """Admission control for a single device. Thread-safe.
+
+    Examples
+    --------
+    >>> limiter = RateLimiter(max_in_flight=4, rates={'GetOper': (10, 20)})
+    >>> client = Client('127.0.0.1', 'demo', 'demo', limiter=limiter)
+    """
+
+    def __init__(self, max_in_flight=None, rates=None, priorities=None):
+        """
+        Parameters
+        ----------
+        max_in_flight : uint, optional
+            Maximum concurrent requests. Defaults to unlimited.
+        rates : dict, optional
+            RPC name, e.g. GetOper, to (rate, burst) in requests per second.
+            The key '*' applies to RPCs not otherwise listed.
+        priorities : dict, optional
+            RPC name to priority, overriding DEFAULT_PRIORITIES.
+        """
+        self.max_in_flight = max_in_flight
+        self.priorities = dict(DEFAULT_PRIORITIES)
+        self.priorities.update(priorities or {})
+        self.__rates = dict(rates or {})
+        self.__buckets = {}
+        self.__in_flight = 0
+        self.__waiting = []
+        self.__sequence = itertools.count()
+        self.__condition = threading.Condition()
+
+    @property
+    def in_flight(self):
+        return self.__in_flight
+
+    @property
+    def waiting(self):
+        return len(self.__waiting)
+
+    def __bucket(self, rpc):
+        if rpc not in self.__buckets:
+            rate = self.__rates.get(rpc, self.__rates.get("*"))
+            self.__buckets[rpc] = TokenBucket(*rate) if rate else None
+        return self.__buckets[rpc]
+
+    def __delay(self, rpc, now):
+        bucket = self.__bucket(rpc)
+        return bucket.delay(now) if bucket else 0
+
+    def __admissible(self, waiter, now):
+        """Whether waiter may run now, ahead of all other ready waiters."""
+        if self.max_in_flight is not None and self.__in_flight >= self.max_in_flight:
+            return False
+        if self.__delay(waiter[2], now):
+            return False
+        for other in self.__waiting:
+            if other[:2] < waiter[:2] and not self.__delay(other[2], now):
+                return False
+        return True
+
+    def acquire(self, rpc, priority=None, timeout=None):
+        """Block until a request of type rpc may be issued.
+
+        Parameters
+        ----------
+        rpc : str
+            RPC name, e.g. GetOper.
+        priority : int, optional
+            Overrides the priority for rpc. Lower is admitted first.
+        timeout : float, optional
+            Maximum seconds to wait. Defaults to waiting indefinitely.
+
+        Returns
+        -------
+        bool
+            False if timed out, otherwise release() must be called.
+        """
+        if priority is None:
+            priority = self.priorities.get(rpc, DEFAULT_PRIORITY)
+        deadline = None if timeout is None else time.time() + timeout
+        with self.__condition:
+            waiter = (priority, next(self.__sequence), rpc)
+            self.__waiting.append(waiter)
+            try:
+                while True:
+                    now = time.time()
+                    if self.__admissible(waiter, now):
+                        bucket = self.__bucket(rpc)
+                        if bucket:
+                            bucket.consume(now)
+                        self.__in_flight += 1
+                        return True
+                    wait = self.__delay(rpc, now) or None
+                    if deadline is not None:
+                        if now >= deadline:
+                            return False
+                        wait = min(wait or deadline - now, deadline - now)
+                    self.__condition.wait(wait)
+            finally:
+                self.__waiting.remove(waiter)
+                self.__condition.notify_all()
+
+    def release(self):
+        with self.__condition:
+            self.__in_flight -= 1
+            self.__condition.notify_all()
+
+    @contextlib.contextmanager
+    def slot(self, rpc, priority=None):
+        """Context manager holding an admission for its duration."""
+        self.acquire(rpc, priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+
+class LimiterRegistry(object):
+    """Shares one RateLimiter per target between Clients."""
+
+    def __init__(self, **limiter_kwargs):
+        """
+        Parameters
+        ----------
+        **limiter_kwargs
+            Arguments for each RateLimiter created, see RateLimiter.
+        """
+        self.limiter_kwargs = limiter_kwargs
+        self.__limiters = {}
+        self.__lock = threading.Lock()
+
+    def get(self, target):
+        """Returns the RateLimiter for target, creating it if needed."""
+        with self.__lock:
+            if target not in self.__limiters:
+                self.__limiters[target] = RateLimiter(**self.limiter_kwargs)
+            return self.__limiters[target]
@@ -0,0 +1,130 @@
+"""Copyright 2019 Cisco Systems
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+"""JSON decoding of large responses in worker processes.
+Decoding a very large YangData payload holds the GIL for its whole
+duration. ProcessDecoder hands payloads above a size threshold to a
+process pool, passing the raw UTF-8 through shared memory where
+available, so threads in the calling process keep running while the
+payload is parsed. Unpickling the decoded result in the calling process
+still holds the GIL, for a time proportional to the size of the tree;
+loads_columns returns far less to unpickle.
+"""
+import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    # Python 3.8+
+    from multiprocessing import shared_memory
+except ImportError:
+    shared_memory = None
+
+from .columnar import to_columns
+
+
+def _attach(name, size):
+    """Reads size bytes from the named shared memory block."""
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        return bytes(block.buf[:size])
+    finally:
+        block.close()
+
+
+def _decode(payload, name, size):
+    if payload is None:
+        payload = _attach(name, size)
+    return json.loads(payload, strict=False)
+
+
+def _decode_columns(payload, name, size, list_name, fields):
+    return to_columns(_decode(payload, name, size), list_name, fields)
+
+
+class ProcessDecoder(object):
+    """Decodes large JSON payloads in a process pool.
+
+    May be passed as decoder to Client or build_response, in which case
+    YangData at or above threshold is decoded by the pool, and anything
+    smaller in the calling thread. Workers are spawned rather than
+    forked, so scripts using it must guard their entry point with
+    if __name__ == '__main__'.
+
+    Examples
+    --------
+    >>> decoder = ProcessDecoder(threshold=32 * 1024 * 1024)
+    >>> client = Client('127.0.0.1', 'demo', 'demo', decoder=decoder)
+    >>> raw = client.get_oper(path, namespace=namespace, decode=False)
+    >>> columns = decoder.loads_columns(raw.yang_data_bytes(), 'If-list')
+    """
+
+    def __init__(self, threshold=16 * 1024 * 1024, max_workers=None):
+        """
+        Parameters
+        ----------
+        threshold : uint, optional
+            Payload size in characters or bytes from which decoding is
+            offloaded.
+        max_workers : uint, optional
+            Worker processes. Defaults to the number of CPUs.
+        """
+        self.threshold = int(threshold)
+        try:
+            # Workers are started lazily, after gRPC has started threads,
+            # which forking may deadlock on.
+            self.__executor = ProcessPoolExecutor(
+                max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        except (AttributeError, TypeError):
+            # Python < 3.7, mp_context is not supported.
+            self.__executor = ProcessPoolExecutor(max_workers=max_workers)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def loads(self, payload):
+        """Decodes payload, a JSON str or UTF-8 bytes."""
+        if len(payload) < self.threshold:
+            return json.loads(payload, strict=False)
+        return self.__submit(_decode, payload)
+
+    def loads_columns(self, payload, list_name, fields=None):
+        """Decodes payload and flattens list_name in the worker process,
+        returning columns as columnar.to_columns would. Only the compact
+        columns are pickled back, not the decoded tree.
+        """
+        return self.__submit(_decode_columns, payload, list_name, fields)
+
+    def close(self, wait=True):
+        self.__executor.shutdown(wait=wait)
+
+    def __submit(self, function, payload, *args):
+        if not isinstance(payload, bytes):
+            payload = payload.encode("utf-8")
+        if shared_memory is None:
+            return self.__executor.submit(function, payload, None, None, *args).result()
+        size = len(payload)
+        block = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        try:
+            block.buf[:size] = payload
+            return self.__executor.submit(
+                function, None, block.name, size, *args
+            ).result()
+        finally:
+            block.close()
+            block.unlink()
@@ -0,0 +1,256 @@
+"""Copyright 2019 Cisco Systems
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+"""Periodic collection of operational data.
+Schedules many (client, path, interval) jobs over a fixed pool of
+worker threads. Start times are jittered to avoid every job firing
+at once, and a job which is still running when it comes due again is
+skipped rather than queued up behind itself.
+"""
+import heapq
+import itertools
+import logging
+import random
+import threading
+import time
+
+try:
+    # Python 3
+    import queue
+except ImportError:
+    # Python 2
+    import Queue as queue
+
+
+class PollJob(object):
+    """A single scheduled collection.
+
+    Attributes
+    ----------
+    client : Client
+    yang_path : str
+    namespace : str
+    interval : float
+        Seconds between collections.
+    kwargs : dict
+        Additional keyword arguments to the client method.
+    method : str
+        Name of the Client method to call, get_oper by default.
+    runs : int
+        Number of completed collections.
+    skipped : int
+        Number of collections skipped due to overrun.
+    last_error : Exception
+        Most recent exception raised by the collection, if any.
+    """
+
+    def __init__(
+        self, client, yang_path, interval, namespace=None, method="get_oper", **kwargs
+    ):
+        if interval <= 0:
+            raise ValueError("interval must be greater than 0!")
+        self.client = client
+        self.yang_path = yang_path
+        self.namespace = namespace
+        self.interval = float(interval)
+        self.method = method
+        self.kwargs = kwargs
+        self.runs = 0
+        self.skipped = 0
+        self.last_error = None
+        self.next_run = None
+        self.running = False
+
+    def __repr__(self):
+        return "<PollJob %s %s every %.1fs>" % (
+            self.method,
+            self.yang_path,
+            self.interval,
+        )
+
+    def execute(self):
+        """Run the collection against the client."""
+        request_method = getattr(self.client, self.method)
+        return request_method(self.yang_path, namespace=self.namespace, **self.kwargs)
+
+
+class Poller(object):
+    """Schedules repeated collections across a shared worker pool.
+
+    Results are delivered to callback as callback(job, response, error),
+    or put on the results queue as (job, response, error) tuples.
+    Exactly one of response or error is not None.
+
+    Examples
+    --------
+    >>> from nxos_grpc import Client, Poller
+    >>> poller = Poller(callback=lambda job, response, error: print(response))
+    >>> poller.add_job(Client('127.0.0.1', 'demo', 'demo'),
+    ...     'Cisco-NX-OS-device:System/intf-items',
+    ...     interval=30,
+    ...     namespace='http://cisco.com/ns/yang/cisco-nx-os-device'
+    ... )
+    >>> poller.start()
+    """
+
+    def __init__(self, callback=None, results=None, workers=16, jitter=None):
+        """
+        Parameters
+        ----------
+        callback : callable, optional
+            Invoked from worker threads with (job, response, error).
+        results : queue.Queue, optional
+            Queue to put (job, response, error) on. Created if neither
+            callback nor results are specified.
+        workers : uint, optional
+            Number of worker threads issuing requests.
+        jitter : float, optional
+            Maximum random delay in seconds before a job first runs.
+            Defaults to the job's interval.
+        """
+        if callback is None and results is None:
+            results = queue.Queue()
+        self.callback = callback
+        self.results = results
+        self.workers = int(workers)
+        self.jitter = jitter
+        self.__schedule = []
+        self.__sequence = itertools.count()
+        self.__condition = threading.Condition()
+        self.__work = queue.Queue()
+        self.__threads = []
+        self.__running = False
+
+    def add_job(self, client, yang_path, interval, namespace=None, **kwargs):
+        """Schedule a new collection. May be called while running.
+
+        Returns
+        -------
+        PollJob
+        """
+        job = PollJob(client, yang_path, interval, namespace=namespace, **kwargs)
+        jitter = job.interval if self.jitter is None else self.jitter
+        job.next_run = time.time() + random.uniform(0, jitter)
+        with self.__condition:
+            heapq.heappush(self.__schedule, (job.next_run, next(self.__sequence), job))
+            self.__condition.notify()
+        return job
+
+    def remove_job(self, job):
+        """Unschedule a collection. An in-progress run still completes."""
+        with self.__condition:
+            self.__schedule = [
+                entry for entry in self.__schedule if entry[2] is not job
+            ]
+            heapq.heapify(self.__schedule)
+
+    @property
+    def jobs(self):
+        with self.__condition:
+            return [entry[2] for entry in self.__schedule]
+
+    def start(self):
+        """Start the scheduler and worker threads."""
+        with self.__condition:
+            if self.__running:
+                return
+            self.__running = True
+        for _ in range(self.workers):
+            self.__spawn(self.__work_loop)
+        self.__spawn(self.__schedule_loop)
+
+    def stop(self, wait=True):
+        """Stop scheduling new collections.
+
+        Parameters
+        ----------
+        wait : bool, optional
+            Block until in-progress collections complete.
+        """
+        with self.__condition:
+            if not self.__running:
+                return
+            self.__running = False
+            self.__condition.notify_all()
+        for _ in range(self.workers):
+            self.__work.put(None)
+        if wait:
+            for thread in self.__threads:
+                thread.join()
+        self.__threads = []
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def __spawn(self, target):
+        thread = threading.Thread(target=target)
+        thread.daemon = True
+        thread.start()
+        self.__threads.append(thread)
+
+    def __schedule_loop(self):
+        """Dispatch due jobs to workers, skipping those still running."""
+        with self.__condition:
+            while self.__running:
+                now = time.time()
+                if not self.__schedule:
+                    self.__condition.wait()
+                    continue
+                next_run, _, job = self.__schedule[0]
+                if next_run > now:
+                    self.__condition.wait(next_run - now)
+                    continue
+                heapq.heappop(self.__schedule)
+                if job.running:
+                    job.skipped += 1
+                    logging.debug("%r still running, skipping.", job)
+                else:
+                    job.running = True
+                    self.__work.put(job)
+                job.next_run = next_run + job.interval
+                if job.next_run <= now:
+                    # Fell behind by more than an interval, coalesce missed runs.
+                    job.next_run = now + job.interval
+                heapq.heappush(
+                    self.__schedule, (job.next_run, next(self.__sequence), job)
+                )
+
+    def __work_loop(self):
+        while True:
+            job = self.__work.get()
+            if job is None:
+                return
+            response, error = None, None
+            try:
+                response = job.execute()
+                job.runs += 1
+            except Exception as e:  # pylint: disable=broad-except
+                logging.exception("Error polling %r!", job)
+                job.last_error = error = e
+            finally:
+                job.running = False
+            self.__deliver(job, response, error)
+
+    def __deliver(self, job, response, error):
+        try:
+            if self.callback is not None:
+                self.callback(job, response, error)
+            if self.results is not None:
+                self.results.put((job, response, error))
+        except Exception:  # pylint: disable=broad-except
+            logging.exception("Error delivering result of %r!", job)
@@ -0,0 +1,211 @@
+"""Copyright 2019 Cisco Systems
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+"""Field projection of list entries while decoding.
+Wide lists such as If-list carry hundreds of leaves per entry when
+only a few are wanted. A Projection decodes YangData one entry of the
+named list at a time and keeps only the selected fields of each, so
+the full entries are never all resident at once. The structure around
+the list is walked by a small scanner, and everything else, including
+each entry, is decoded by the json module.
+"""
+import json
+import re
+from json.decoder import scanstring
+
+from .tree import entry_key
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+def compile_fields(fields):
+    """Compiles field paths such as rmonIfIn-items/ucastPkts into a
+    nested dict, with None marking a selected subtree.
+    """
+    spec = {}
+    for field in fields:
+        node = spec
+        names = field.strip("/").split("/")
+        for name in names[:-1]:
+            child = node.get(name, {})
+            if child is None:
+                break
+            node = node.setdefault(name, child)
+        else:
+            node[names[-1]] = None
+    return spec
+
+
+def project(entry, spec):
+    """Returns the portion of entry selected by a compile_fields spec."""
+    projected = {}
+    for name, child in spec.items():
+        if name not in entry:
+            continue
+        value = entry[name]
+        if child is None:
+            projected[name] = value
+        elif isinstance(value, dict):
+            projected[name] = project(value, child)
+        elif isinstance(value, list):
+            projected[name] = [
+                project(item, child) for item in value if isinstance(item, dict)
+            ]
+    return projected
+
+
+class Projection(object):
+    """Decoder keeping selected fields of each entry of a list.
+
+    May be passed as decoder to build_response. List entries keep their
+    key leaf, see tree.entry_key, so that they remain identifiable.
+
+    Examples
+    --------
+    >>> projection = Projection('If-list', ['id', 'operSt'])
+    >>> projection.loads(payload)
+    """
+
+    def __init__(self, list_name, fields, object_pairs_hook=None):
+        """
+        Parameters
+        ----------
+        list_name : str
+            Name of the list whose entries are projected, e.g. If-list.
+        fields : list of str
+            Leaf or subtree paths relative to each entry.
+        object_pairs_hook : callable, optional
+            Applied to every decoded object, e.g. schema.TypeTable.convert.
+        """
+        self.list_name = list_name
+        self.fields = list(fields)
+        self.spec = compile_fields(self.fields)
+        self.object_pairs_hook = object_pairs_hook
+        self.__marker = json.dumps(list_name)
+        self.__decoder = json.JSONDecoder(
+            strict=False, object_pairs_hook=object_pairs_hook
+        )
+
+    def project(self, entry):
+        if not isinstance(entry, dict):
+            return entry
+        projected = project(entry, self.spec)
+        for name, value in entry_key(entry):
+            projected.setdefault(name, value)
+        return projected
+
+    def loads(self, payload):
+        """Decodes a JSON str or UTF-8 bytes payload."""
+        if isinstance(payload, bytes):
+            payload = payload.decode("utf-8")
+        return _Scanner(self, payload).decode()
+
+    def raw_decode(self, text, index):
+        return self.__decoder.raw_decode(text, index)
+
+    @property
+    def marker(self):
+        """The list name as it appears as a JSON key."""
+        return self.__marker
+
+
+class _Scanner(object):
+    """Decodes one document for a Projection."""
+
+    def __init__(self, projection, text):
+        self.projection = projection
+        self.text = text
+        self.next_marker = -1
+
+    def decode(self):
+        value, index = self.value(self.skip(0))
+        if self.skip(index) != len(self.text):
+            raise ValueError("Extra data after JSON document!")
+        return value
+
+    def skip(self, index):
+        return _WHITESPACE.match(self.text, index).end()
+
+    def value(self, index):
+        """Decodes the value at index, returning (value, end)."""
+        if self.next_marker != -1 and self.next_marker < index:
+            self.next_marker = -1
+        if self.next_marker == -1:
+            self.next_marker = self.text.find(self.projection.marker, index)
+        char = self.text[index : index + 1]
+        if self.next_marker == -1 or char not in ("{", "["):
+            # Nothing to project from here on.
+            return self.projection.raw_decode(self.text, index)
+        if char == "{":
+            return self.object(index + 1)
+        return self.array(index + 1, self.value)
+
+    def object(self, index):
+        text = self.text
+        pairs = []
+        index = self.skip(index)
+        if text[index : index + 1] == "}":
+            return self.build(pairs), index + 1
+        while True:
+            if text[index : index + 1] != '"':
+                raise ValueError("Expected property name at %i!" % index)
+            name, index = scanstring(text, index + 1, False)
+            index = self.skip(index)
+            if text[index : index + 1] != ":":
+                raise ValueError("Expected ':' at %i!" % index)
+            index = self.skip(index + 1)
+            if name == self.projection.list_name:
+                value, index = self.entries(index)
+            else:
+                value, index = self.value(index)
+            pairs.append((name, value))
+            index = self.skip(index)
+            char = text[index : index + 1]
+            if char == "}":
+                return self.build(pairs), index + 1
+            if char != ",":
+                raise ValueError("Expected ',' or '}' at %i!" % index)
+            index = self.skip(index + 1)
+
+    def array(self, index, decode_item):
+        text = self.text
+        items = []
+        index = self.skip(index)
+        if text[index : index + 1] == "]":
+            return items, index + 1
+        while True:
+            item, index = decode_item(index)
+            items.append(item)
+            index = self.skip(index)
+            char = text[index : index + 1]
+            if char == "]":
+                return items, index + 1
+            if char != ",":
+                raise ValueError("Expected ',' or ']' at %i!" % index)
+            index = self.skip(index + 1)
+
+    def entries(self, index):
+        """Decodes a list value, projecting each entry as it is decoded."""
+        if self.text[index : index + 1] == "[":
+            return self.array(index + 1, self.entry)
+        return self.entry(index)
+
+    def entry(self, index):
+        entry, index = self.projection.raw_decode(self.text, index)
+        return self.projection.project(entry), index
+
+    def build(self, pairs):
+        if self.projection.object_pairs_hook is not None:
+            return self.projection.object_pairs_hook(pairs)
+        return dict(pairs)
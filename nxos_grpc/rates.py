@@ -0,0 +1,240 @@
+"""Copyright 2019 Cisco Systems
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+"""Per-second rates from successive counter samples.
+Previous samples are kept per (target, path) as a layout of counter
+names per list entry or container and a flat array of unsigned 64-bit
+values, rather than as decoded trees. Rates are returned as a flat
+array of doubles aligned with the leaf paths, which numpy.frombuffer
+can wrap without copying.
+"""
+import array
+import collections
+import threading
+import time
+
+from .tree import entry_element, is_list, list_entries
+
+"""Rates for one sample.
+leaves is a tuple of leaf paths joined by '/', values an array('d')
+of per-second rates aligned with leaves, and elapsed the seconds
+since the previous sample. A rate is NaN when there is no previous
+value or the counter was reset.
+"""
+Rates = collections.namedtuple("Rates", ["leaves", "values", "elapsed"])
+
+_NAN = float("nan")
+
+
+class _Sample(object):
+    """layout is a tuple of (prefix, counter names) per container, with
+    values flat in the same order. Leaf paths are joined on first use,
+    and shared by following samples of the same layout.
+    """
+
+    __slots__ = ("layout", "values", "timestamp", "__leaves", "__index")
+
+    def __init__(self, layout, values, timestamp):
+        self.layout = layout
+        self.values = values
+        self.timestamp = timestamp
+        self.__leaves = None
+        self.__index = None
+
+    @property
+    def leaves(self):
+        if self.__leaves is None:
+            self.__leaves = tuple(
+                prefix + name for prefix, names in self.layout for name in names
+            )
+        return self.__leaves
+
+    def share(self, previous):
+        """Shares the layout of previous, which must be equal."""
+        self.layout = previous.layout
+        self.__leaves = previous.leaves
+
+    def lookup(self, prefix, name):
+        """Position of a counter in this sample, or None."""
+        if self.__index is None:
+            self.__index = {}
+            offset = 0
+            for container, names in self.layout:
+                self.__index[container] = (offset, names)
+                offset += len(names)
+        offset, names = self.__index.get(prefix, (None, ()))
+        if name not in names:
+            return None
+        return offset + names.index(name)
+
+
+def _as_counter(value):
+    """Returns value as a non-negative int, or None if not a counter."""
+    if value.__class__ is int:
+        # Not isinstance, which would accept bool.
+        return value if value >= 0 else None
+    if isinstance(value, str) and value.isdigit():
+        return int(value)
+    return None
+
+
+class CounterRates(object):
+    """Computes counter rates across successive polls.
+
+    Examples
+    --------
+    >>> rates = CounterRates(counters={'inOctets', 'outOctets'})
+    >>> response = client.get_oper(path, namespace=namespace)
+    >>> sample = rates.update('switch1', path, response.YangData)
+    >>> dict(zip(sample.leaves, sample.values))
+    ...
+    """
+
+    def __init__(self, counters=None, width=64, list_keys=None):
+        """
+        Parameters
+        ----------
+        counters : set of str, optional
+            Leaf names to treat as counters. Defaults to every leaf
+            with a non-negative integer value.
+        width : uint, optional
+            Counter width in bits, used for wrap detection.
+        list_keys : dict, optional
+            Mapping of list name to key leaf names, see tree.entry_key.
+        """
+        self.counters = frozenset(counters) if counters else None
+        self.width = int(width)
+        if not 0 < self.width <= 64:
+            raise ValueError("Counter width must be between 1 and 64 bits!")
+        self.list_keys = list_keys
+        self.__samples = {}
+        self.__lock = threading.Lock()
+
+    def update(self, target, path, yang_data, timestamp=None):
+        """Stores a new sample and computes rates against the previous one.
+
+        Parameters
+        ----------
+        target : str
+            Device identifier.
+        path : str
+            Request path identifier.
+        yang_data : dict
+            Decoded YangData, e.g. gRPCResponse.YangData.
+        timestamp : float, optional
+            Sample time in seconds. Defaults to now.
+
+        Returns
+        -------
+        Rates
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        current = self.__sample(yang_data, timestamp)
+        with self.__lock:
+            previous = self.__samples.get((target, path))
+            self.__samples[(target, path)] = current
+        return self.__rates(previous, current)
+
+    def forget(self, target, path=None):
+        """Drops stored samples for target, or a single path of target."""
+        with self.__lock:
+            for key in list(self.__samples):
+                if key[0] == target and (path is None or key[1] == path):
+                    del self.__samples[key]
+
+    def __sample(self, yang_data, timestamp):
+        layout = []
+        values = array.array("Q")
+        if isinstance(yang_data, (dict, list)):
+            self.__collect(yang_data, "", layout, values)
+        return _Sample(tuple(layout), values, timestamp)
+
+    def __collect(self, node, prefix, layout, values):
+        """Appends the counters of node, a dict or list, and below."""
+        if isinstance(node, dict):
+            items = node.items()
+        else:
+            items = [("[%i]" % index, item) for index, item in enumerate(node)]
+        counters = self.counters
+        limit = 1 << self.width
+        # Counters of node itself follow those of its children, as does
+        # its layout entry.
+        names = []
+        counts = []
+        for name, value in items:
+            if isinstance(value, (dict, list)):
+                if is_list(name):
+                    self.__collect_entries(
+                        name, value, prefix, names, counts, layout, values
+                    )
+                else:
+                    self.__collect(value, prefix + name + "/", layout, values)
+            # Names are checked before any other work on the leaf.
+            elif counters is None or name in counters:
+                counter = _as_counter(value)
+                if counter is not None and counter < limit:
+                    names.append(name)
+                    counts.append(counter)
+        if names:
+            layout.append((prefix, tuple(names)))
+            values.extend(counts)
+
+    def __collect_entries(self, name, value, prefix, names, counts, layout, values):
+        """Appends the counters of the entries of list name, with those of
+        leaf-list entries to names and counts.
+        """
+        key_names = self.list_keys.get(name) if self.list_keys else None
+        counters = self.counters
+        limit = 1 << self.width
+        for index, entry in enumerate(list_entries(value)):
+            element = entry_element(name, entry, index, key_names)
+            if isinstance(entry, (dict, list)):
+                self.__collect(entry, prefix + element + "/", layout, values)
+            elif counters is None or element in counters:
+                counter = _as_counter(entry)
+                if counter is not None and counter < limit:
+                    names.append(element)
+                    counts.append(counter)
+
+    def __rates(self, previous, current):
+        rates = array.array("d", [_NAN]) * len(current.values)
+        if previous is None:
+            return Rates(current.leaves, rates, None)
+        elapsed = current.timestamp - previous.timestamp
+        if elapsed <= 0:
+            return Rates(current.leaves, rates, elapsed)
+        if previous.layout == current.layout:
+            # Share the layout between samples rather than holding two copies.
+            current.share(previous)
+            positions = range(len(current.values))
+        else:
+            positions = [
+                previous.lookup(prefix, name)
+                for prefix, names in current.layout
+                for name in names
+            ]
+        modulus = 1 << self.width
+        previous_values = previous.values
+        for i, (value, position) in enumerate(zip(current.values, positions)):
+            if position is None:
+                continue
+            delta = value - previous_values[position]
+            if delta < 0:
+                delta += modulus
+                if delta >= modulus >> 1:
+                    # Too large to be a wrap, the counter was reset.
+                    continue
+            rates[i] = float(delta) / elapsed
+        return Rates(current.leaves, rates, elapsed)
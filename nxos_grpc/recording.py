@@ -0,0 +1,397 @@
+"""Copyright 2019 Cisco Systems
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+"""Record and replay of response streams.
+A Recorder captures the raw reply chunks of GetOper, Get and GetConfig
+streams, with their ReqIDs, arrival times and boundaries, to a compact
+binary log. Logs may be read back as RecordedStreams, or served by a
+ReplayChannel in place of a real channel so that parsing and analytics
+can be rerun offline against production payloads.
+
+Log format
+----------
+A magic header followed by records of a fixed little-endian header
+(kind, stream, ReqID, time, length a, length b) and two UTF-8 fields
+of those lengths. Per kind the time and fields are:
+
+START   wall clock start  a: JSON {"rpc", "target"}  b: request YangPath
+CHUNK   seconds since START  a: YangData  b: Errors
+END     seconds since START  a: status code name  b: status details
+"""
+import collections
+import gzip
+import io
+import itertools
+import json
+import struct
+import threading
+import time
+
+from .exceptions import ReplayError
+
+MAGIC = b"NXGRPCREC\x01"
+RECORDED_RPCS = frozenset(["GetOper", "Get", "GetConfig"])
+
+START = 1
+CHUNK = 2
+END = 3
+
+_HEADER = struct.Struct("<BIqdII")
+
+"""Reply shaped like the generated protobuf reply messages."""
+Chunk = collections.namedtuple("Chunk", ["ReqID", "YangData", "Errors"])
+
+"""A recorded stream. chunks is a list of (seconds since started, Chunk).
+status is the final gRPC status code name, or None if the log ended
+before the stream did.
+"""
+RecordedStream = collections.namedtuple(
+    "RecordedStream",
+    ["rpc", "target", "yang_path", "req_id", "started", "chunks", "status", "details"],
+)
+
+
+def _open(path, mode, compress):
+    if "r" in mode:
+        # Sniff for gzip rather than trusting the file name.
+        with io.open(path, "rb") as fd:
+            compress = fd.read(2) == b"\x1f\x8b"
+    if compress or path.endswith(".gz"):
+        return gzip.open(path, mode)
+    return io.open(path, mode)
+
+
+class Recorder(object):
+    """Writes response streams to a binary log. Thread-safe.
+
+    Examples
+    --------
+    >>> with Recorder('oper.rec.gz') as recorder:
+    ...     client = Client('127.0.0.1', 'demo', 'demo', recorder=recorder)
+    ...     client.get_oper(path, namespace=namespace)
+    """
+
+    def __init__(self, destination, compress=False):
+        """
+        Parameters
+        ----------
+        destination : str or file-like
+            File path to append to, or a binary file-like object.
+        compress : bool, optional
+            gzip compress the log. Implied by a .gz file path.
+        """
+        self.__owned = not hasattr(destination, "write")
+        if self.__owned:
+            self.__fd = _open(destination, "ab", compress)
+        else:
+            self.__fd = destination
+        self.__lock = threading.Lock()
+        self.__streams = itertools.count()
+        with self.__lock:
+            self.__fd.write(MAGIC)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def wrap(self, rpc_name, target, request_args, stream):
+        """Returns stream, recording it as it is consumed if rpc_name is
+        a streaming RPC.
+        """
+        if rpc_name not in RECORDED_RPCS:
+            return stream
+        stream_id = next(self.__streams) & 0xFFFFFFFF
+        started = time.time()
+        metadata = json.dumps({"rpc": rpc_name, "target": target})
+        self.write(
+            START,
+            stream_id,
+            request_args.ReqID,
+            started,
+            metadata,
+            request_args.YangPath,
+        )
+        return _RecordingStream(self, stream_id, request_args.ReqID, started, stream)
+
+    def write(self, kind, stream_id, req_id, timestamp, a="", b=""):
+        """Appends a single record."""
+        a = a.encode("utf-8")
+        b = b.encode("utf-8")
+        record = _HEADER.pack(kind, stream_id, req_id, timestamp, len(a), len(b))
+        with self.__lock:
+            self.__fd.write(record + a + b)
+
+    def flush(self):
+        with self.__lock:
+            self.__fd.flush()
+
+    def close(self):
+        with self.__lock:
+            self.__fd.flush()
+            if self.__owned:
+                self.__fd.close()
+
+
+class _RecordingStream(object):
+    """Iterates a response stream, recording each chunk."""
+
+    def __init__(self, recorder, stream_id, req_id, started, stream):
+        self.__recorder = recorder
+        self.__stream_id = stream_id
+        self.__req_id = req_id
+        self.__started = started
+        self.__stream = stream
+        self.__iterator = iter(stream)
+        self.__ended = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            chunk = next(self.__iterator)
+        except StopIteration:
+            self.__end("OK")
+            raise
+        except Exception as error:
+            code = error.code() if hasattr(error, "code") else None
+            details = error.details() if hasattr(error, "details") else str(error)
+            self.__end(getattr(code, "name", None) or type(error).__name__, details)
+            raise
+        self.__recorder.write(
+            CHUNK,
+            self.__stream_id,
+            chunk.ReqID,
+            time.time() - self.__started,
+            chunk.YangData,
+            chunk.Errors,
+        )
+        return chunk
+
+    next = __next__
+
+    def cancel(self):
+        self.__end("CANCELLED")
+        return self.__stream.cancel()
+
+    def __end(self, status, details=""):
+        if self.__ended:
+            return
+        self.__ended = True
+        self.__recorder.write(
+            END,
+            self.__stream_id,
+            self.__req_id,
+            time.time() - self.__started,
+            status,
+            details or "",
+        )
+
+
+def read_log(source):
+    """Reads recorded streams from a log.
+
+    Parameters
+    ----------
+    source : str or file-like
+        Log file path, optionally gzip compressed, or a binary file-like
+        object.
+
+    Yields
+    ------
+    RecordedStream
+        In order of completion, followed by any streams the log ended
+        during.
+    """
+    owned = not hasattr(source, "read")
+    fd = _open(source, "rb", False) if owned else source
+    try:
+        if fd.read(len(MAGIC)) != MAGIC:
+            raise ValueError("Not a response stream log!")
+        open_streams = collections.OrderedDict()
+        for record in _records(fd):
+            if record is None:
+                # Another Recorder appended to the log, its stream IDs
+                # start over and earlier unfinished streams never end.
+                for stream in open_streams.values():
+                    yield stream
+                open_streams.clear()
+                continue
+            kind, stream_id, req_id, timestamp, a, b = record
+            if kind == START:
+                metadata = json.loads(a)
+                open_streams[stream_id] = RecordedStream(
+                    metadata["rpc"],
+                    metadata["target"],
+                    b,
+                    req_id,
+                    timestamp,
+                    [],
+                    None,
+                    None,
+                )
+            elif kind == CHUNK:
+                open_streams[stream_id].chunks.append((timestamp, Chunk(req_id, a, b)))
+            elif kind == END:
+                stream = open_streams.pop(stream_id)
+                yield stream._replace(status=a, details=b)
+        for stream in open_streams.values():
+            yield stream
+    finally:
+        if owned:
+            fd.close()
+
+
+def _records(fd):
+    """Yields records until EOF, and None for each repeated header."""
+    while True:
+        header = fd.read(_HEADER.size)
+        if not header:
+            return
+        if header.startswith(MAGIC):
+            yield None
+            header = header[len(MAGIC) :]
+            header += fd.read(_HEADER.size - len(header))
+            if not header:
+                return
+        if len(header) < _HEADER.size:
+            raise ValueError("Truncated response stream log!")
+        kind, stream_id, req_id, timestamp, a_size, b_size = _HEADER.unpack(header)
+        a = fd.read(a_size).decode("utf-8")
+        b = fd.read(b_size).decode("utf-8")
+        yield kind, stream_id, req_id, timestamp, a, b
+
+
+def replay(source, decode=True):
+    """Rebuilds responses from a log at full speed.
+
+    Yields
+    ------
+    (RecordedStream, gRPCResponse)
+        Streams which did not end OK are skipped.
+    """
+    from .response import build_response
+
+    for stream in read_log(source):
+        if stream.status != "OK":
+            continue
+        yield stream, build_response(
+            stream.req_id, (chunk for _, chunk in stream.chunks), decode=decode
+        )
+
+
+class ReplayChannel(object):
+    """Stands in for a grpc.Channel, serving recorded streams.
+
+    Requests are answered by the next recorded stream of the same RPC
+    and request YangPath, in recorded order, regardless of ReqID.
+
+    Examples
+    --------
+    >>> client = Client('127.0.0.1', 'demo', 'demo',
+    ...     channel=ReplayChannel('oper.rec.gz')
+    ... )
+    >>> client.get_oper(path, namespace=namespace)
+    """
+
+    def __init__(self, source, realtime=False, loop=False):
+        """
+        Parameters
+        ----------
+        source : str, file-like, or iterable of RecordedStream
+            Log to serve, see read_log.
+        realtime : bool, optional
+            Deliver chunks with their recorded timing rather than at
+            full speed.
+        loop : bool, optional
+            Serve recorded streams again once all have been served.
+        """
+        if isinstance(source, str) or hasattr(source, "read"):
+            source = read_log(source)
+        self.realtime = realtime
+        self.loop = loop
+        self.__streams = collections.defaultdict(collections.deque)
+        for stream in source:
+            self.__streams[(stream.rpc, stream.yang_path)].append(stream)
+        self.__lock = threading.Lock()
+
+    def unary_stream(self, method, *args, **kwargs):
+        rpc_name = method.rsplit("/", 1)[-1]
+
+        def call(request, timeout=None, metadata=None, **kwargs):
+            stream = self.__next_stream(rpc_name, request)
+            return _ReplayCall(stream, request.ReqID, self.realtime)
+
+        return call
+
+    def unary_unary(self, method, *args, **kwargs):
+        rpc_name = method.rsplit("/", 1)[-1]
+
+        def call(request, timeout=None, metadata=None, **kwargs):
+            raise ReplayError(rpc_name, "UNIMPLEMENTED", "RPC is not recorded.")
+
+        return call
+
+    def close(self):
+        pass
+
+    def __next_stream(self, rpc_name, request):
+        with self.__lock:
+            streams = self.__streams.get((rpc_name, request.YangPath))
+            if not streams:
+                raise ReplayError(rpc_name, "NOT_FOUND", "No recorded stream left.")
+            stream = streams.popleft()
+            if self.loop:
+                streams.append(stream)
+        return stream
+
+
+class _ReplayCall(object):
+    """Iterates a recorded stream like a gRPC streaming call. Chunks
+    echo the replayed request's ReqID in place of the recorded one.
+    """
+
+    def __init__(self, stream, req_id, realtime):
+        self.__stream = stream
+        self.__req_id = req_id
+        self.__realtime = realtime
+        self.__chunks = iter(stream.chunks)
+        self.__started = time.time()
+        self.__cancelled = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.__cancelled:
+            raise ReplayError(self.__stream.rpc, "CANCELLED", "Call cancelled.")
+        for offset, chunk in self.__chunks:
+            if self.__realtime:
+                time.sleep(max(self.__started + offset - time.time(), 0))
+            if chunk.ReqID == self.__stream.req_id:
+                chunk = chunk._replace(ReqID=self.__req_id)
+            return chunk
+        if self.__stream.status != "OK":
+            raise ReplayError(
+                self.__stream.rpc, self.__stream.status, self.__stream.details
+            )
+        raise StopIteration()
+
+    next = __next__
+
+    def cancel(self):
+        self.__cancelled = True
+        return True
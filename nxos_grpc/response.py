@@ -20,11 +20,25 @@ formed, and then when finalized exposes dict reprs of the
 YangData and Errors data.
 TODO: Simplify?
 """
+import io
 import json
 import logging
+import sys
 
+from .buffer import SpillBuffer
+from .exceptions import ReplayError, RPCError
 
-def build_response(reqid, response_stream):
+
+def build_response(
+    reqid,
+    response_stream,
+    decode=True,
+    sink=None,
+    spill_threshold=None,
+    decoder=None,
+    cancel_on_error=False,
+    raise_on_error=False,
+):
     """Build a gRPCResponse from response stream.
 
     Parameters
@@ -33,6 +47,27 @@ def build_response(reqid, response_stream):
         The request ID to indicate to the device.
     response_stream : object, iterable
         gRPC response stream to consume and assemble.
+    decode : bool, optional
+        Finalize the response, parsing YangData and Errors JSON.
+        If False the raw chunks are only assembled, see yang_data_bytes().
+    sink : file-like, optional
+        Write YangData chunks to sink as they arrive instead of
+        accumulating them. Text sinks receive str, others UTF-8 bytes.
+        The response is finalized with YangData None; Errors are still
+        parsed.
+    spill_threshold : uint, optional
+        Characters of YangData to hold in memory before spilling the
+        remainder to a temporary file. Defaults to never spilling.
+    decoder : object, optional
+        Object with a loads(payload) method used to decode YangData,
+        e.g. offload.ProcessDecoder. Defaults to json.loads.
+    cancel_on_error : bool, optional
+        Cancel response_stream and stop reading once it has carried
+        complete Errors. The partial YangData is then not decoded,
+        and the response is marked cancelled.
+    raise_on_error : bool, optional
+        Fail fast, raising RPCError from the first complete Errors
+        received, after cancelling response_stream.
 
     Returns
     -------
@@ -43,22 +78,172 @@ def build_response(reqid, response_stream):
     ------
     Exception
         Response stream ReqIDs do not match.
+    RPCError
+        The device returned Errors and raise_on_error is set.
 
     Notes
     -----
     gRPCResponse does not serialize YangData or Errors with strict
     JSON parsing (carriage returns etc.). This could present some issues.
     """
-    response_obj = gRPCResponse(reqid)
+    response_obj = gRPCResponse(reqid, spill_threshold=spill_threshold)
+    if sink is not None:
+        is_text = isinstance(sink, io.TextIOBase)
+        for response in response_stream:
+            response_obj.add_errors(response.ReqID, response.Errors)
+            if response.YangData:
+                sink.write(
+                    response.YangData if is_text else response.YangData.encode("utf-8")
+                )
+            if (cancel_on_error or raise_on_error) and _errors_ready(
+                response, response_obj
+            ):
+                response_obj.cancelled = cancel_stream(response_stream)
+                break
+        if raise_on_error and response_obj.errors_complete():
+            raise response_obj.rpc_error()
+        # YangData went to sink, only Errors are left to parse.
+        try:
+            response_obj.finalize()
+        except json.decoder.JSONDecodeError:
+            logging.exception("Error finalizing response Errors JSON!")
+        return response_obj
     for response in response_stream:
         response_obj.add_data(response.ReqID, response.YangData, response.Errors)
+        if (cancel_on_error or raise_on_error) and _errors_ready(
+            response, response_obj
+        ):
+            response_obj.cancelled = cancel_stream(response_stream)
+            break
+    if raise_on_error and response_obj.errors_complete():
+        raise response_obj.rpc_error()
+    if not decode:
+        return response_obj
     try:
-        response_obj.finalize()
+        response_obj.finalize(decoder)
     except json.decoder.JSONDecodeError:
         logging.exception('Error finalizing response JSON! Returning potentially un-finalized elements.')
     return response_obj
 
 
+def _errors_ready(response, response_obj):
+    """Whether response carried Errors completing those received."""
+    return bool(response.Errors) and response_obj.errors_complete()
+
+
+def cancel_stream(response_stream):
+    """Cancels response_stream if it is a cancellable call.
+    Returns whether it was, False for a call which already ended.
+    """
+    cancel = getattr(response_stream, "cancel", None)
+    if cancel is None:
+        return False
+    return bool(cancel())
+
+
+def _is_rpc_error(error):
+    """Whether error carries the status ending a call, without importing
+    grpc.
+    """
+    if isinstance(error, ReplayError):
+        return True
+    grpc = sys.modules.get("grpc")
+    return grpc is not None and isinstance(error, grpc.RpcError)
+
+
+class ResponseStream(object):
+    """Handle on a response stream which may be abandoned early.
+
+    Iterating yields the reply chunks as received, each with ReqID,
+    YangData, and Errors. The underlying call is cancelled if the stream
+    is closed before it is exhausted, whether by cancel(), leaving a
+    with block, breaking out of iteration, or, with cancel_on_error,
+    once a chunk carries Errors. A ResponseStream is iterated only once,
+    and build_response(stream.req_id, stream) assembles what remains.
+
+    Examples
+    --------
+    >>> with client.stream(path, namespace=namespace) as stream:
+    ...     for chunk in stream:
+    ...         if enough(chunk.YangData):
+    ...             break
+    """
+
+    def __init__(self, reqid, response_stream, on_close=None, cancel_on_error=False):
+        """
+        Parameters
+        ----------
+        reqid : uint
+            The request ID chunks must carry.
+        response_stream : object, iterable
+            gRPC response stream, cancelled through its cancel() method.
+        on_close : callable, optional
+            Called once when the stream ends, is cancelled, or fails,
+            with the exception raised by the stream or None.
+        cancel_on_error : bool, optional
+            Cancel once a chunk carries Errors.
+        """
+        self.req_id = reqid
+        self.cancel_on_error = cancel_on_error
+        self.chunks = 0
+        self.cancelled = False
+        self.__stream = response_stream
+        self.__on_close = on_close
+        self.__exhausted = False
+        self.__closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __iter__(self):
+        # Not retained, so that breaking out of a loop closes the
+        # generator and with it the call.
+        return self.__chunks()
+
+    def __chunks(self):
+        try:
+            for chunk in self.__stream:
+                if chunk.ReqID != self.req_id:
+                    raise Exception("ReqIDs in response stream do not match!")
+                self.chunks += 1
+                yield chunk
+                if self.cancel_on_error and chunk.Errors:
+                    break
+            else:
+                self.__exhausted = True
+        except GeneratorExit:
+            # Iteration was broken out of.
+            pass
+        except BaseException as error:
+            # Only a status ends the call, which is otherwise cancelled,
+            # e.g. on a ReqID mismatch or KeyboardInterrupt.
+            self.__exhausted = _is_rpc_error(error)
+            self.__close(error)
+            raise
+        self.close()
+
+    def cancel(self):
+        """Cancels the call unless already exhausted, see close()."""
+        self.close()
+        return self.cancelled
+
+    def close(self):
+        """Ends the stream, cancelling the call if not exhausted."""
+        self.__close(None)
+
+    def __close(self, error):
+        if self.__closed:
+            return
+        self.__closed = True
+        if not self.__exhausted:
+            self.cancelled = cancel_stream(self.__stream)
+        if self.__on_close is not None:
+            self.__on_close(error)
+
+
 class gRPCResponse(object):
     """Response wrapper. Fields accessible via dict or attribute access.
 
@@ -67,6 +252,14 @@ class gRPCResponse(object):
     req_id || ReqID
     yang_data || YangData
     errors || Errors
+    cancelled : bool
+        The stream was cancelled early and YangData is incomplete.
+
+    Notes
+    -----
+    Slotted to keep per-instance overhead low when holding many
+    responses. The CamelCase names are properties aliasing the
+    snake_case attributes rather than separately stored copies.
 
     Methods
     -------
@@ -76,25 +269,73 @@ class gRPCResponse(object):
         Add raw YangData to existing parsed chunks.
     add_errors(...)
         Add raw Errors to existing parsed chunks.
+    errors_complete()
+        Whether the raw Errors received form complete JSON.
+    rpc_error()
+        Errors as a raisable RPCError.
     finalize()
         Parse raw data into dicts for easier Pythonic usage.
+    yang_data_bytes()
+        Raw YangData as UTF-8 bytes, without parsing.
+    yang_data_view()
+        Raw YangData as a memoryview, mmap backed if spilled to disk.
+    close()
+        Release any temporary file holding spilled YangData.
     as_dict_raw()
         Raw data in dict form.
     as_dict()
         dict-ified data in dict form.
+    derive(...)
+        Finalized copy with different YangData.
     """
 
-    def __init__(self, ReqID):
+    __slots__ = (
+        "req_id",
+        "yang_data",
+        "errors",
+        "cancelled",
+        "__finalized",
+        "__yang_data_raw",
+        "__errors_raw",
+    )
+
+    def __init__(self, ReqID, spill_threshold=None):
         self.req_id = ReqID
-        self.ReqID = self.req_id
         self.yang_data = None
-        self.YangData = self.yang_data
         self.errors = None
-        self.Errors = self.errors
+        self.cancelled = False
         self.__finalized = False
-        self.__yang_data_raw = ""
+        # str for a single chunk, list while assembling several, or a
+        # SpillBuffer when spilling to disk is enabled.
+        self.__yang_data_raw = (
+            "" if spill_threshold is None else SpillBuffer(spill_threshold)
+        )
         self.__errors_raw = ""
 
+    @property
+    def ReqID(self):
+        return self.req_id
+
+    @ReqID.setter
+    def ReqID(self, value):
+        self.req_id = value
+
+    @property
+    def YangData(self):
+        return self.yang_data
+
+    @YangData.setter
+    def YangData(self, value):
+        self.yang_data = value
+
+    @property
+    def Errors(self):
+        return self.errors
+
+    @Errors.setter
+    def Errors(self, value):
+        self.errors = value
+
     def __getitem__(self, key):
         """Enable usage of attribute-like access like original data structure."""
         allowed_keys = {"ReqID", "YangData", "Errors"}
@@ -102,7 +343,7 @@ class gRPCResponse(object):
             raise Exception("Key not allowed for dict-like access!")
         if not self.__finalized:
             raise Exception("Must finalize before dict representation!")
-        return self.__dict__[key]
+        return getattr(self, key)
 
     def __repr__(self):
         """JSON dump raw data in instance."""
@@ -120,31 +361,110 @@ class gRPCResponse(object):
 
     def add_yang_data(self, req_id, data):
         self.__check_req_id(req_id)
-        self.__yang_data_raw += data
+        if not data:
+            return
+        if isinstance(self.__yang_data_raw, SpillBuffer):
+            # Tested first, an empty SpillBuffer is falsy.
+            self.__yang_data_raw.append(data)
+        elif not self.__yang_data_raw:
+            self.__yang_data_raw = data
+        elif isinstance(self.__yang_data_raw, list):
+            self.__yang_data_raw.append(data)
+        else:
+            # str, or unicode on Python 2.
+            self.__yang_data_raw = [self.__yang_data_raw, data]
 
     def add_errors(self, req_id, errors):
         self.__check_req_id(req_id)
         self.__errors_raw += errors
 
-    def finalize(self):
-        """Serialize raw, received data to Python dicts."""
-        self.yang_data = (
-            json.loads(self.__yang_data_raw, strict=False)
-            if self.__yang_data_raw
-            else None
-        )
-        self.YangData = self.yang_data
+    def errors_complete(self):
+        """Whether the raw Errors received so far are complete JSON."""
+        if not self.__errors_raw:
+            return False
+        try:
+            json.loads(self.__errors_raw, strict=False)
+        except ValueError:
+            return False
+        return True
+
+    def rpc_error(self):
+        """Returns the received Errors as an RPCError."""
+        errors = self.errors
+        if errors is None and self.__errors_raw:
+            errors = json.loads(self.__errors_raw, strict=False)
+        return RPCError(errors, self.req_id)
+
+    def finalize(self, decoder=None):
+        """Serialize raw, received data to Python dicts.
+
+        YangData of a cancelled response is incomplete and left None.
+
+        Parameters
+        ----------
+        decoder : object, optional
+            Object with a loads(payload) method used to decode YangData,
+            e.g. offload.ProcessDecoder. Defaults to json.loads.
+        """
+        if isinstance(self.__yang_data_raw, list):
+            self.__yang_data_raw = "".join(self.__yang_data_raw)
+        yang_data_raw = self.__yang_data_raw
+        if isinstance(yang_data_raw, SpillBuffer):
+            yang_data_raw = "" if self.cancelled else yang_data_raw.getvalue()
+        if not yang_data_raw or self.cancelled:
+            self.yang_data = None
+        elif decoder is not None:
+            self.yang_data = decoder.loads(yang_data_raw)
+        else:
+            self.yang_data = json.loads(yang_data_raw, strict=False)
         self.errors = (
             json.loads(self.__errors_raw, strict=False) if self.__errors_raw else None
         )
-        self.Errors = self.errors
         self.__finalized = True
 
+    def yang_data_bytes(self):
+        """Returns the raw YangData as UTF-8 bytes without parsing."""
+        if isinstance(self.__yang_data_raw, SpillBuffer):
+            return self.__yang_data_raw.getbytes()
+        return self.__yang_data_str().encode("utf-8")
+
+    def yang_data_view(self):
+        """Returns the raw YangData as a read-only memoryview of UTF-8.
+        Backed by an mmap of the spill file when spilled to disk.
+        """
+        if isinstance(self.__yang_data_raw, SpillBuffer):
+            return self.__yang_data_raw.view()
+        return memoryview(self.yang_data_bytes())
+
+    def close(self):
+        """Releases the spill file, if any. Raw data is no longer available."""
+        if isinstance(self.__yang_data_raw, SpillBuffer):
+            self.__yang_data_raw.close()
+
+    def __yang_data_str(self):
+        if isinstance(self.__yang_data_raw, SpillBuffer):
+            return self.__yang_data_raw.getvalue()
+        if isinstance(self.__yang_data_raw, list):
+            return "".join(self.__yang_data_raw)
+        return self.__yang_data_raw
+
+    def derive(self, yang_data):
+        """Returns a finalized response with the same ReqID and Errors
+        and the given, already decoded, YangData. Raw YangData is not
+        carried over.
+        """
+        response = gRPCResponse(self.req_id)
+        response.add_errors(self.req_id, self.__errors_raw)
+        response.errors = self.errors
+        response.yang_data = yang_data
+        response.__finalized = True
+        return response
+
     def as_dict_raw(self):
         """Returns the raw data representations."""
         return {
             "ReqID": self.req_id,
-            "YangData": self.__yang_data_raw,
+            "YangData": self.__yang_data_str(),
             "Errors": self.__errors_raw,
         }
 
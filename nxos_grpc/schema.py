@@ -0,0 +1,232 @@
+"""Copyright 2019 Cisco Systems
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+"""Schema-aware typed decoding of YangData.
+The device encodes many numeric and boolean leaves as JSON strings. A
+TypeTable maps leaf names to their YANG base types, compiled once from
+the YANG model, e.g. Cisco-NX-OS-device.yang, and converts leaf values
+while the JSON is parsed rather than in a second walk of the tree.
+Leaves are looked up by name alone, as the decoder does not see paths;
+names whose types conflict within the model are left unconverted.
+"""
+import io
+import json
+import re
+
+try:
+    # Python 3
+    from sys import intern
+except ImportError:
+    # Python 2
+    pass
+
+INT = "int"
+FLOAT = "float"
+BOOL = "bool"
+ENUM = "enum"
+
+_YANG_TYPES = {
+    "int8": INT,
+    "int16": INT,
+    "int32": INT,
+    "int64": INT,
+    "uint8": INT,
+    "uint16": INT,
+    "uint32": INT,
+    "uint64": INT,
+    "decimal64": FLOAT,
+    "boolean": BOOL,
+    "enumeration": ENUM,
+}
+
+_TOKEN = re.compile(
+    r"""\s+|//[^\n]*|/\*.*?\*/|"((?:[^"\\]|\\.)*)"|'([^']*)'|([{};])|([^\s{};"']+)""",
+    re.S,
+)
+
+
+def _to_int(value):
+    try:
+        return int(value)
+    except ValueError:
+        return value
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+
+def _to_bool(value):
+    if value == "true":
+        return True
+    if value == "false":
+        return False
+    return value
+
+
+# Enumeration values recur throughout replies, interning shares them.
+_CONVERTERS = {INT: _to_int, FLOAT: _to_float, BOOL: _to_bool, ENUM: intern}
+
+
+def _statements(text):
+    """Yields (depth, keyword, argument, has_body) for YANG statements."""
+    depth = 0
+    words = []
+    for match in _TOKEN.finditer(text):
+        double, single, punctuation, word = match.groups()
+        if punctuation is None:
+            if double is not None:
+                words.append(double)
+            elif single is not None:
+                words.append(single)
+            elif word is not None and word != "+":
+                words.append(word)
+            continue
+        if punctuation == "}":
+            depth -= 1
+            continue
+        if words:
+            yield depth, words[0], "".join(words[1:]), punctuation == "{"
+            words = []
+        if punctuation == "{":
+            depth += 1
+
+
+def _local_name(name):
+    return name.rsplit(":", 1)[-1]
+
+
+def compile_yang(texts):
+    """Compiles leaf types from YANG module texts.
+
+    Parameters
+    ----------
+    texts : iterable of str
+        YANG module sources, including those defining imported typedefs.
+
+    Returns
+    -------
+    dict
+        Leaf name to INT, FLOAT, BOOL or ENUM. Leaves of other types,
+        unions, and names with conflicting types are omitted.
+    """
+    typedefs = {}
+    leaf_types = {}
+    for text in texts:
+        # (depth, keyword, argument) of the enclosing statements.
+        parents = []
+        for depth, keyword, argument, has_body in _statements(text):
+            del parents[depth:]
+            if keyword == "type" and parents:
+                parent_keyword, parent_name = parents[-1][1:]
+                if parent_keyword == "typedef":
+                    typedefs[parent_name] = _local_name(argument)
+                elif parent_keyword in ("leaf", "leaf-list"):
+                    leaf_types.setdefault(parent_name, set()).add(_local_name(argument))
+            if has_body:
+                parents.append((depth, keyword, _local_name(argument)))
+    types = {}
+    for name, yang_types in leaf_types.items():
+        resolved = set(_resolve(yang_type, typedefs) for yang_type in yang_types)
+        if len(resolved) == 1 and None not in resolved:
+            types[name] = resolved.pop()
+    return types
+
+
+def _resolve(yang_type, typedefs):
+    seen = set()
+    while yang_type not in _YANG_TYPES:
+        if yang_type in seen or yang_type not in typedefs:
+            return None
+        seen.add(yang_type)
+        yang_type = typedefs[yang_type]
+    return _YANG_TYPES[yang_type]
+
+
+class TypeTable(object):
+    """Leaf name to type lookup table and typed JSON decoder.
+
+    May be passed as decoder to Client or build_response.
+
+    Examples
+    --------
+    >>> table = TypeTable.from_yang(['Cisco-NX-OS-device.yang'])
+    >>> table.dump('nxos-types.json')
+    >>> client = Client('127.0.0.1', 'demo', 'demo',
+    ...     decoder=TypeTable.load('nxos-types.json')
+    ... )
+    """
+
+    def __init__(self, types):
+        """
+        Parameters
+        ----------
+        types : dict
+            Leaf name to INT, FLOAT, BOOL or ENUM.
+        """
+        self.types = dict(types)
+        self.__converters = dict(
+            (name, _CONVERTERS[kind]) for name, kind in self.types.items()
+        )
+
+    def __len__(self):
+        return len(self.types)
+
+    @classmethod
+    def from_yang(cls, paths):
+        """Compiles a TypeTable from YANG module files, see compile_yang."""
+        texts = []
+        for path in paths:
+            with io.open(path, encoding="utf-8") as yang_file:
+                texts.append(yang_file.read())
+        return cls(compile_yang(texts))
+
+    @classmethod
+    def load(cls, path):
+        """Loads a TypeTable precompiled with dump()."""
+        with io.open(path, encoding="utf-8") as table_file:
+            return cls(json.load(table_file)["types"])
+
+    def dump(self, path):
+        with io.open(path, "w", encoding="utf-8") as table_file:
+            table_file.write(
+                json.dumps({"types": self.types}, sort_keys=True, indent=0)
+            )
+
+    def convert(self, pairs):
+        """object_pairs_hook converting string leaf and leaf-list values
+        by type.
+        """
+        converters = self.__converters
+        obj = {}
+        for name, value in pairs:
+            if name in converters:
+                if isinstance(value, str):
+                    value = converters[name](value)
+                elif isinstance(value, list):
+                    # leaf-list
+                    convert = converters[name]
+                    value = [
+                        convert(item) if isinstance(item, str) else item
+                        for item in value
+                    ]
+            obj[name] = value
+        return obj
+
+    def loads(self, payload):
+        """Decodes a JSON str or UTF-8 bytes payload with typed leaves."""
+        return json.loads(payload, strict=False, object_pairs_hook=self.convert)
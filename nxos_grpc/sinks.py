@@ -0,0 +1,313 @@
+"""Copyright 2019 Cisco Systems
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+"""Batched persistence of responses.
+Responses are buffered in memory, bounded by max_buffered, and written
+in batches from a background thread either when batch_size records
+have accumulated or flush_interval seconds have passed. Writers block
+when the buffer is full rather than growing without limit.
+"""
+import gzip
+import io
+import json
+import logging
+import sqlite3
+import threading
+import time
+
+_COLUMNS = ("timestamp", "target", "path", "ReqID", "YangData", "Errors")
+
+
+def _dumps(data):
+    """Compact JSON, None is preserved for NULL-able columns."""
+    if data is None:
+        return None
+    return json.dumps(data, separators=(",", ":"))
+
+
+def _single_line(raw):
+    """Returns raw JSON on one line. Multi-line JSON is re-encoded, as
+    line breaks may be raw control characters within strings.
+    """
+    if raw is None or ("\n" not in raw and "\r" not in raw):
+        return raw
+    return _dumps(json.loads(raw, strict=False))
+
+
+class Sink(object):
+    """Base class for batched response writers.
+
+    Subclasses implement _write_batch(records) and optionally _close().
+    Records are dicts keyed by timestamp, target, path, ReqID, YangData,
+    and Errors, with YangData and Errors as JSON strings as received.
+
+    Methods
+    -------
+    write(...)
+        Buffer a response for writing.
+    flush()
+        Write all buffered responses now.
+    close()
+        Flush and release the underlying resource.
+    poller_callback(...)
+        Poller callback writing successful collections.
+    """
+
+    def __init__(self, batch_size=500, max_buffered=10000, flush_interval=1.0):
+        """
+        Parameters
+        ----------
+        batch_size : uint, optional
+            Number of buffered records which triggers a write.
+        max_buffered : uint, optional
+            Number of buffered records at which write() blocks.
+        flush_interval : float, optional
+            Maximum seconds a record is buffered before being written.
+        """
+        if max_buffered < batch_size:
+            raise ValueError("max_buffered must not be less than batch_size!")
+        self.batch_size = int(batch_size)
+        self.max_buffered = int(max_buffered)
+        self.flush_interval = float(flush_interval)
+        self.__buffer = []
+        self.__condition = threading.Condition()
+        self.__write_lock = threading.Lock()
+        self.__closed = False
+        self.__thread = threading.Thread(target=self.__flush_loop)
+        self.__thread.daemon = True
+        self.__thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def write(self, response, target=None, path=None, timestamp=None):
+        """Buffer a gRPCResponse for writing. YangData of cancelled
+        responses is incomplete and not written.
+
+        Parameters
+        ----------
+        response : gRPCResponse
+            Response, finalized or not, e.g. from decode=False.
+        target : str, optional
+            Device identifier to record.
+        path : str, optional
+            Request path to record.
+        timestamp : float, optional
+            Defaults to now.
+        """
+        raw = response.as_dict_raw()
+        # The raw JSON as received is stored, finalized or not, and is
+        # only re-encoded for derived responses which carry none.
+        yang_data = None if response.cancelled else raw["YangData"]
+        record = {
+            "timestamp": time.time() if timestamp is None else timestamp,
+            "target": target,
+            "path": path,
+            "ReqID": response.req_id,
+            "YangData": yang_data or _dumps(response.yang_data),
+            "Errors": raw["Errors"] or _dumps(response.errors),
+        }
+        with self.__condition:
+            while not self.__closed and len(self.__buffer) >= self.max_buffered:
+                self.__condition.wait()
+            if self.__closed:
+                raise Exception("Sink is closed!")
+            self.__buffer.append(record)
+            if len(self.__buffer) >= self.batch_size:
+                self.__condition.notify_all()
+
+    def poller_callback(self, job, response, error):
+        """Callback for Poller which writes successful collections."""
+        if error is None:
+            self.write(response, target=job.client.target, path=job.yang_path)
+
+    def flush(self):
+        """Write all buffered records."""
+        with self.__condition:
+            records, self.__buffer = self.__buffer, []
+            self.__condition.notify_all()
+        self.__write(records)
+
+    def close(self):
+        """Flush remaining records and close the sink."""
+        with self.__condition:
+            if self.__closed:
+                return
+            self.__closed = True
+            self.__condition.notify_all()
+        self.__thread.join()
+        self.flush()
+        self._close()
+
+    def __write(self, records):
+        if not records:
+            return
+        with self.__write_lock:
+            try:
+                self._write_batch(records)
+            except Exception:  # pylint: disable=broad-except
+                logging.exception("Error writing %i records!", len(records))
+
+    def __flush_loop(self):
+        while True:
+            with self.__condition:
+                deadline = time.time() + self.flush_interval
+                while (
+                    not self.__closed
+                    and len(self.__buffer) < self.batch_size
+                    and time.time() < deadline
+                ):
+                    self.__condition.wait(max(deadline - time.time(), 0))
+                if self.__closed:
+                    return
+                records, self.__buffer = self.__buffer, []
+                self.__condition.notify_all()
+            self.__write(records)
+
+    def _write_batch(self, records):
+        raise NotImplementedError()
+
+    def _close(self):
+        pass
+
+
+class NDJSONSink(Sink):
+    """Writes one JSON object per line, optionally gzip compressed.
+
+    Examples
+    --------
+    >>> with NDJSONSink('oper.ndjson.gz', compress=True) as sink:
+    ...     sink.write(client.get_oper(path, namespace=namespace), path=path)
+    """
+
+    def __init__(self, destination, compress=False, **kwargs):
+        """
+        Parameters
+        ----------
+        destination : str or file-like
+            File path to append to, or a text file-like object.
+        compress : bool, optional
+            gzip compress output. Only applies to file paths.
+        """
+        self.__owned = not hasattr(destination, "write")
+        if not self.__owned:
+            self.__fd = destination
+        elif compress:
+            self.__fd = gzip.open(destination, "at", encoding="utf-8")
+        else:
+            self.__fd = io.open(destination, "a", encoding="utf-8")
+        super(NDJSONSink, self).__init__(**kwargs)
+
+    def _write_batch(self, records):
+        lines = []
+        for record in records:
+            # YangData and Errors are already JSON, splice rather than re-encode.
+            lines.append(
+                '{"timestamp":%s,"target":%s,"path":%s,"ReqID":%s,'
+                '"YangData":%s,"Errors":%s}\n'
+                % (
+                    json.dumps(record["timestamp"]),
+                    json.dumps(record["target"]),
+                    json.dumps(record["path"]),
+                    json.dumps(record["ReqID"]),
+                    _single_line(record["YangData"]) or "null",
+                    _single_line(record["Errors"]) or "null",
+                )
+            )
+        self.__fd.write("".join(lines))
+        self.__fd.flush()
+
+    def _close(self):
+        if self.__owned:
+            self.__fd.close()
+
+
+class SQLiteSink(Sink):
+    """Writes records as rows of a SQLite table with bulk inserts."""
+
+    def __init__(self, database, table="responses", **kwargs):
+        """
+        Parameters
+        ----------
+        database : str
+            SQLite database path.
+        table : str, optional
+            Table to insert into, created if it does not exist.
+        """
+        self.table = table
+        self.__connection = sqlite3.connect(database, check_same_thread=False)
+        self.__connection.execute(
+            "CREATE TABLE IF NOT EXISTS %s (timestamp REAL, target TEXT, path TEXT,"
+            " req_id INTEGER, yang_data TEXT, errors TEXT)" % table
+        )
+        self.__connection.commit()
+        self.__insert = "INSERT INTO %s VALUES (?, ?, ?, ?, ?, ?)" % table
+        super(SQLiteSink, self).__init__(**kwargs)
+
+    def _write_batch(self, records):
+        with self.__connection:
+            self.__connection.executemany(
+                self.__insert,
+                [tuple(record[column] for column in _COLUMNS) for record in records],
+            )
+
+    def _close(self):
+        self.__connection.close()
+
+
+class ParquetSink(Sink):
+    """Writes each batch as a Parquet row group. Requires pyarrow."""
+
+    def __init__(self, path, compression="snappy", **kwargs):
+        """
+        Parameters
+        ----------
+        path : str
+            Parquet file path, overwritten if it exists.
+        compression : str, optional
+            Parquet compression codec.
+        """
+        import pyarrow
+        import pyarrow.parquet
+
+        self.__pyarrow = pyarrow
+        self.__schema = pyarrow.schema(
+            [
+                ("timestamp", pyarrow.float64()),
+                ("target", pyarrow.string()),
+                ("path", pyarrow.string()),
+                ("ReqID", pyarrow.uint64()),
+                ("YangData", pyarrow.string()),
+                ("Errors", pyarrow.string()),
+            ]
+        )
+        self.__writer = pyarrow.parquet.ParquetWriter(
+            path, self.__schema, compression=compression
+        )
+        super(ParquetSink, self).__init__(**kwargs)
+
+    def _write_batch(self, records):
+        table = self.__pyarrow.Table.from_pydict(
+            dict(
+                (column, [record[column] for record in records]) for column in _COLUMNS
+            ),
+            schema=self.__schema,
+        )
+        self.__writer.write_table(table)
+
+    def _close(self):
+        self.__writer.close()
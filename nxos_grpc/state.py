@@ -0,0 +1,177 @@
+"""Copyright 2019 Cisco Systems
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+"""Compact store of the last known state of many devices.
+Holds the latest YangData per target and path as zlib compressed raw
+JSON, typically a small fraction of the size of the decoded dicts.
+Reads decompress and decode on demand, keeping a bounded LRU of decoded
+trees for frequently read paths.
+"""
+import collections
+import json
+import threading
+import time
+import zlib
+
+"""Metadata of a stored state. size is the raw JSON size in bytes,
+compressed_size its stored size.
+"""
+StateInfo = collections.namedtuple(
+    "StateInfo", ["target", "path", "timestamp", "size", "compressed_size"]
+)
+
+
+class StateStore(object):
+    """Latest YangData per (target, path). Thread-safe.
+
+    Examples
+    --------
+    >>> store = StateStore()
+    >>> poller = Poller(callback=store.poller_callback)
+    >>> poller.add_job(client, path, interval=30, namespace=namespace,
+    ...     decode=False
+    ... )
+    >>> store.get(client.target, path)
+    """
+
+    def __init__(self, level=6, cache_size=128, decoder=None):
+        """
+        Parameters
+        ----------
+        level : int, optional
+            zlib compression level.
+        cache_size : uint, optional
+            Decoded trees to keep for repeated reads. 0 disables caching.
+        decoder : object, optional
+            Object with a loads(payload) method used to decode reads,
+            e.g. schema.TypeTable. Defaults to json.loads.
+        """
+        self.level = level
+        self.cache_size = cache_size
+        self.decoder = decoder
+        # (target, path) to (timestamp, size, compressed JSON)
+        self.__states = {}
+        self.__cache = collections.OrderedDict()
+        self.__lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.__states)
+
+    def __contains__(self, key):
+        return key in self.__states
+
+    def put(self, target, path, response, timestamp=None):
+        """Stores the YangData of response as the state of target and path.
+        Unfinalized responses, e.g. from decode=False, are stored from
+        their raw JSON without ever being decoded.
+
+        Parameters
+        ----------
+        target : str
+        path : str
+        response : gRPCResponse, str, or bytes
+            Response, or raw YangData JSON.
+        timestamp : float, optional
+            Defaults to now.
+
+        Raises
+        ------
+        ValueError
+            response was cancelled, e.g. by cancel_on_error, and its
+            YangData is incomplete.
+        """
+        if getattr(response, "cancelled", False):
+            raise ValueError("Cancelled responses hold incomplete YangData!")
+        if isinstance(response, bytes):
+            raw = response
+        elif isinstance(response, str):
+            raw = response.encode("utf-8")
+        else:
+            raw = response.yang_data_bytes()
+            if not raw and response.yang_data is not None:
+                # Derived responses carry no raw JSON.
+                raw = json.dumps(response.yang_data, separators=(",", ":"))
+                raw = raw.encode("utf-8")
+        state = (
+            time.time() if timestamp is None else timestamp,
+            len(raw),
+            zlib.compress(raw, self.level),
+        )
+        key = (target, path)
+        with self.__lock:
+            self.__states[key] = state
+            self.__cache.pop(key, None)
+
+    def get(self, target, path, default=None):
+        """Returns the decoded state of target and path, or default.
+        Returned trees may be shared with other readers, do not modify.
+        """
+        key = (target, path)
+        with self.__lock:
+            if key in self.__cache:
+                self.__cache[key] = self.__cache.pop(key)
+                return self.__cache[key]
+            state = self.__states.get(key)
+        if state is None:
+            return default
+        raw = zlib.decompress(state[2])
+        if not raw:
+            yang_data = None
+        elif self.decoder is not None:
+            yang_data = self.decoder.loads(raw)
+        else:
+            yang_data = json.loads(raw.decode("utf-8"), strict=False)
+        if self.cache_size:
+            with self.__lock:
+                # Only cache if not replaced while decoding.
+                if self.__states.get(key) is state:
+                    self.__cache[key] = yang_data
+                    while len(self.__cache) > self.cache_size:
+                        self.__cache.popitem(last=False)
+        return yang_data
+
+    def get_raw(self, target, path):
+        """Returns the state of target and path as raw JSON bytes, or None."""
+        with self.__lock:
+            state = self.__states.get((target, path))
+        return None if state is None else zlib.decompress(state[2])
+
+    def info(self, target=None):
+        """Returns StateInfo of stored states, optionally of one target."""
+        with self.__lock:
+            states = list(self.__states.items())
+        return [
+            StateInfo(key[0], key[1], state[0], state[1], len(state[2]))
+            for key, state in states
+            if target is None or key[0] == target
+        ]
+
+    def forget(self, target, path=None):
+        """Removes the states of target, or of only one path."""
+        with self.__lock:
+            keys = [
+                key
+                for key in self.__states
+                if key[0] == target and (path is None or key[1] == path)
+            ]
+            for key in keys:
+                del self.__states[key]
+                self.__cache.pop(key, None)
+
+    def poller_callback(self, job, response, error):
+        """Callback for Poller which stores successful collections.
+        Responses with Errors are skipped, keeping the last good state.
+        """
+        if error is None and not (response.cancelled or response.errors_complete()):
+            self.put(job.client.target, job.yang_path, response)
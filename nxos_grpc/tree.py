@@ -0,0 +1,136 @@
+"""Copyright 2019 Cisco Systems
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+"""Helpers for walking decoded YangData trees.
+NX-OS names YANG lists with a -list suffix, e.g. If-list, and
+returns their entries as a JSON array, or as a bare object when
+there is only a single entry.
+"""
+
+LIST_SUFFIX = "-list"
+
+"""Leaves commonly used as list keys in the NX-OS device model.
+Used when no explicit keys are known for a list.
+"""
+DEFAULT_LIST_KEYS = ("id", "name", "addr", "ip", "key", "type")
+
+
+def is_list(name):
+    """Whether the element name refers to a YANG list."""
+    return name.endswith(LIST_SUFFIX)
+
+
+def list_entries(value):
+    """Normalize a YANG list value to a list of entries."""
+    if value is None:
+        return []
+    if isinstance(value, dict):
+        return [value]
+    return value
+
+
+def entry_key(entry, key_names=None):
+    """Returns the key of a list entry as a tuple of (name, value) pairs.
+    Empty if no key leaves are present.
+
+    Parameters
+    ----------
+    entry : dict
+        List entry.
+    key_names : iterable of str, optional
+        Key leaf names. If not specified, the first of DEFAULT_LIST_KEYS
+        present in the entry is used.
+    """
+    if key_names:
+        return tuple((name, entry.get(name)) for name in key_names)
+    for name in DEFAULT_LIST_KEYS:
+        value = entry.get(name)
+        if value is not None and not isinstance(value, (dict, list)):
+            return ((name, value),)
+    return ()
+
+
+def format_entry(list_name, key):
+    """Formats a list entry path element, e.g. If-list[id=eth1/1]."""
+    return "%s%s" % (list_name, "".join("[%s=%s]" % pair for pair in key))
+
+
+def entry_element(list_name, entry, index, key_names=None):
+    """Path element for a list entry, falling back to its position
+    when the entry has no key leaves, e.g. If-list[3].
+    """
+    key = entry_key(entry, key_names) if isinstance(entry, dict) else ()
+    if not key:
+        return "%s[%i]" % (list_name, index)
+    return format_entry(list_name, key)
+
+
+def find_lists(tree, list_name):
+    """Yields every entry of every occurrence of list_name in tree."""
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(reversed(node))
+        elif isinstance(node, dict):
+            children = []
+            for name, value in node.items():
+                if name == list_name:
+                    for entry in list_entries(value):
+                        yield entry
+                elif isinstance(value, (dict, list)):
+                    children.append(value)
+            stack.extend(reversed(children))
+
+
+def iter_leaves(tree, prefix=(), list_keys=None):
+    """Yields (path, value) for every leaf below tree.
+    path is a tuple of element names relative to tree, with list
+    entries formatted by format_entry.
+
+    Parameters
+    ----------
+    tree : dict
+        Decoded YangData.
+    prefix : tuple, optional
+        Path to prepend to yielded paths.
+    list_keys : dict, optional
+        Mapping of list name to key leaf names, see entry_key.
+    """
+    list_keys = list_keys or {}
+    stack = [(prefix, tree)]
+    while stack:
+        path, node = stack.pop()
+        if isinstance(node, dict):
+            children = []
+            for name, value in node.items():
+                if is_list(name) and isinstance(value, (dict, list)):
+                    key_names = list_keys.get(name)
+                    for index, entry in enumerate(list_entries(value)):
+                        element = entry_element(name, entry, index, key_names)
+                        children.append((path + (element,), entry))
+                else:
+                    children.append((path + (name,), value))
+            stack.extend(reversed(children))
+        elif isinstance(node, list):
+            stack.extend(
+                reversed(
+                    [
+                        (path + ("[%i]" % index,), value)
+                        for index, value in enumerate(node)
+                    ]
+                )
+            )
+        else:
+            yield path, node
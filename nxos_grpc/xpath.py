@@ -0,0 +1,302 @@
+"""Copyright 2019 Cisco Systems
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+"""XPath to NX-OS JSON request conversion.
+XPaths are compiled to the NX-OS JSON request form, with list key
+predicates such as If-list[id=eth1/1] becoming an entry carrying the
+key leaves, which asks the device for only that entry. Several XPaths
+may be merged into a single request tree, and the reply split back out
+into the portion answering each XPath. Parsing and compilation results
+are cached.
+"""
+import collections
+import json
+
+try:
+    # Python 3
+    from functools import lru_cache
+except ImportError:
+    # Python 2
+    lru_cache = None
+
+from .tree import is_list, list_entries, entry_key
+
+"""A single XPath element. keys is a tuple of (name, value) pairs."""
+Element = collections.namedtuple("Element", ["name", "keys"])
+
+_CACHE_SIZE = 4096
+
+
+def _cached(function):
+    if lru_cache is None:
+        return function
+    return lru_cache(maxsize=_CACHE_SIZE)(function)
+
+
+def _invalid(xpath, reason):
+    return ValueError("Invalid xpath %r: %s!" % (xpath, reason))
+
+
+@_cached
+def parse_xpath(xpath):
+    """Parses an XPath into a tuple of Elements.
+
+    Elements are separated by /, and may be followed by any number of
+    [key=value] predicates. Values may be quoted with ' or ", and any
+    character may be escaped with a backslash. / is only a separator
+    outside of predicates, so If-list[id=eth1/1] needs no escaping.
+
+    Raises
+    ------
+    ValueError
+        The XPath is malformed.
+    """
+    body = xpath.strip("/")
+    if not body:
+        raise _invalid(xpath, "empty")
+    elements = []
+    name = []
+    keys = []
+    index = 0
+    length = len(body)
+    while index <= length:
+        char = body[index] if index < length else "/"
+        if char == "\\":
+            if index + 1 >= length:
+                raise _invalid(xpath, "trailing escape")
+            if keys:
+                raise _invalid(xpath, "characters after predicate")
+            name.append(body[index + 1])
+            index += 2
+        elif char == "/":
+            if not name:
+                raise _invalid(xpath, "empty element")
+            elements.append(Element("".join(name), tuple(keys)))
+            name = []
+            keys = []
+            index += 1
+        elif char == "[":
+            if not name:
+                raise _invalid(xpath, "predicate without element")
+            key, index = _parse_predicate(body, index + 1, length)
+            if key[0] in dict(keys):
+                raise _invalid(xpath, "duplicate key %s" % key[0])
+            keys.append(key)
+        elif char in "]=":
+            raise _invalid(xpath, "unexpected %s" % char)
+        else:
+            if keys:
+                raise _invalid(xpath, "characters after predicate")
+            name.append(char)
+            index += 1
+    return tuple(elements)
+
+
+def _parse_predicate(xpath, index, length):
+    """Parses key=value] starting at index.
+    Returns ((key, value), index after the closing bracket).
+    """
+    key = []
+    while True:
+        if index >= length:
+            raise _invalid(xpath, "unterminated predicate")
+        char = xpath[index]
+        if char == "\\" and index + 1 < length:
+            key.append(xpath[index + 1])
+            index += 2
+        elif char == "=":
+            index += 1
+            break
+        elif char in "[]/":
+            raise _invalid(xpath, "expected = in predicate")
+        else:
+            key.append(char)
+            index += 1
+    key = "".join(key).strip()
+    if not key:
+        raise _invalid(xpath, "empty key in predicate")
+    value = []
+    quote = None
+    if index < length and xpath[index] in "'\"":
+        quote = xpath[index]
+        index += 1
+    while True:
+        if index >= length:
+            raise _invalid(xpath, "unterminated predicate")
+        char = xpath[index]
+        if char == "\\" and index + 1 < length:
+            value.append(xpath[index + 1])
+            index += 2
+        elif quote and char == quote:
+            index += 1
+            if index >= length or xpath[index] != "]":
+                raise _invalid(xpath, "expected ] after quoted value")
+            return (key, "".join(value)), index + 1
+        elif not quote and char == "]":
+            return (key, "".join(value)), index + 1
+        elif not quote and char in "[=":
+            raise _invalid(xpath, "unexpected %s in predicate" % char)
+        else:
+            value.append(char)
+            index += 1
+
+
+@_cached
+def compile_xpath(xpath, namespace):
+    """Compiles an XPath to a JSON request payload.
+
+    Parameters
+    ----------
+    xpath : str
+    namespace : str
+        YANG namespace applicable to the XPath.
+
+    Returns
+    -------
+    str
+        JSON request payload.
+    """
+    return _compile((xpath,), namespace)
+
+
+def merge_xpaths(xpaths, namespace):
+    """Merges XPaths into a single JSON request payload.
+    An XPath which is a prefix of another requests the entire subtree,
+    so the longer XPath is subsumed by it. Likewise a list requested
+    without keys subsumes requests for specific entries.
+
+    Parameters
+    ----------
+    xpaths : list of str
+    namespace : str
+        YANG namespace applicable to the XPaths.
+
+    Returns
+    -------
+    str
+        JSON request payload.
+    """
+    return _compile(tuple(xpaths), namespace)
+
+
+@_cached
+def _compile(xpaths, namespace):
+    if not namespace:
+        raise ValueError("Must include namespace if constructing from xpath!")
+    if not xpaths:
+        raise ValueError("Must include at least one xpath!")
+    # None marks an element whose entire subtree is requested.
+    tree = {}
+    for xpath in xpaths:
+        elements = parse_xpath(xpath)
+        branch = None
+        for element in reversed(elements):
+            branch = {element: branch}
+        _merge_into(tree, branch)
+    request = _terminate(tree)
+    request["namespace"] = namespace
+    return json.dumps(request)
+
+
+def _merge_into(destination, source):
+    for element, child in source.items():
+        if element not in destination:
+            destination[element] = child
+        elif destination[element] is None:
+            continue
+        elif child is None:
+            destination[element] = None
+        else:
+            _merge_into(destination[element], child)
+
+
+def _terminate(tree):
+    """Converts the internal tree to the JSON request form."""
+    names = collections.OrderedDict()
+    for element, child in tree.items():
+        names.setdefault(element.name, []).append((element.keys, child))
+    request = {}
+    for name, entries in names.items():
+        unkeyed = [child for keys, child in entries if not keys]
+        if unkeyed:
+            # The whole list is requested, fold keyed requests into it.
+            merged = unkeyed[0]
+            for keys, child in entries:
+                if not keys or merged is None:
+                    continue
+                if child is None:
+                    merged = None
+                else:
+                    _merge_into(merged, child)
+            request[name] = {} if merged is None else _terminate(merged)
+            continue
+        request[name] = []
+        for keys, child in entries:
+            entry = dict(keys)
+            if child is not None:
+                entry.update(_terminate(child))
+            request[name].append(entry)
+    return request
+
+
+def select_xpath(yang_data, xpath):
+    """Returns the portion of yang_data answering xpath, in the same
+    shape as a reply to a request for xpath alone. List entries are
+    filtered by any key predicates, and list entries along the path keep
+    their key leaves so they remain identifiable.
+
+    Returns
+    -------
+    dict
+        None if the reply contains nothing for xpath.
+    """
+    return _prune(yang_data, parse_xpath(xpath))
+
+
+def _matches(entry, keys):
+    for name, value in keys:
+        if name not in entry or str(entry[name]) != value:
+            return False
+    return True
+
+
+def _prune(node, elements, list_element=None):
+    if not elements:
+        return node
+    if isinstance(node, list):
+        entries = [_prune(entry, elements, list_element) for entry in node]
+        entries = [entry for entry in entries if entry is not None]
+        return entries or None
+    element = elements[0]
+    if not isinstance(node, dict) or element.name not in node:
+        return None
+    value = node[element.name]
+    if element.keys:
+        value = [
+            entry
+            for entry in list_entries(value)
+            if isinstance(entry, dict) and _matches(entry, element.keys)
+        ]
+        if not value:
+            return None
+    child = _prune(
+        value, elements[1:], element if is_list(element.name) or element.keys else None
+    )
+    if child is None:
+        return None
+    pruned = {element.name: child}
+    if list_element is not None:
+        key_names = [name for name, _ in list_element.keys]
+        pruned.update(entry_key(node, key_names))
+    return pruned
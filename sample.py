@@ -53,3 +53,5 @@ print(
         indent=4
     )
 )
+
+client.close()
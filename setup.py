@@ -38,12 +38,13 @@ VERSION = '0.1.1'
 
 # What packages are required for this module to be executed?
 REQUIRED = [
-    'grpcio', 'protobuf',
+    'grpcio', 'protobuf', 'futures; python_version < "3"',
 ]
 
 # What packages are optional?
 EXTRAS = {
-    # 'fancy feature': ['django'],
+    'columnar': ['numpy', 'pandas', 'pyarrow'],
+    'parquet': ['pyarrow'],
 }
 
 # The rest you shouldn't have to touch too much :)
@@ -118,7 +119,10 @@ setup(
     author_email=EMAIL,
     python_requires=REQUIRES_PYTHON,
     url=URL,
-    py_modules=['nxos_grpc',],
+    packages=find_packages(exclude=('benchmarks', 'tests', 'tests.*')),
+    entry_points={
+        'console_scripts': ['nxos-grpc=nxos_grpc.cli:main'],
+    },
     install_requires=REQUIRED,
     extras_require=EXTRAS,
     include_package_data=True,
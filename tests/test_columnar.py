@@ -0,0 +1,104 @@
+"""Copyright 2019 Cisco Systems
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+"""Tests of flattening YANG lists into columns."""
+import array
+import math
+
+import pytest
+
+from nxos_grpc.columnar import (
+    DictionaryColumn,
+    MaskedColumn,
+    to_arrow,
+    to_columns,
+    to_dataframe,
+    to_numpy,
+)
+
+
+def interfaces(*entries):
+    return {"System": {"If-list": list(entries)}}
+
+
+def column(*values):
+    entries = [{"v": value} if value is not None else {} for value in values]
+    return to_columns(interfaces(*entries), "If-list")["v"]
+
+
+def test_decimal_strings_converted():
+    assert list(column("0", "-7", "1500")) == [0, -7, 1500]
+    values = column("0.5", "-2.25", "3")
+    assert values.typecode == "d"
+    assert list(values) == [0.5, -2.25, 3.0]
+
+
+@pytest.mark.parametrize(
+    "value", ["0001", " 7 ", "7 ", "+7", "1e3", "nan", "inf", "-inf", "1.", ".5", ""]
+)
+def test_other_strings_not_converted(value):
+    values = column(value, "1")
+    assert isinstance(values, DictionaryColumn)
+    assert values.categories == [value, "1"]
+
+
+def test_convert_strings_disabled():
+    columns = to_columns(interfaces({"v": "1"}), "If-list", convert_strings=False)
+    assert columns["v"] == DictionaryColumn(array.array("i", [0]), ["1"])
+
+
+def test_missing_integers_masked():
+    values = column(2**64 - 1, None, "1")
+    assert isinstance(values, MaskedColumn)
+    assert values.values.typecode == "Q"
+    assert list(values.values) == [2**64 - 1, 0, 1]
+    assert list(values.mask) == [0, 1, 0]
+
+
+def test_missing_floats_nan():
+    values = column(0.5, None)
+    assert values[0] == 0.5
+    assert math.isnan(values[1])
+
+
+def test_integers_beyond_int64_and_uint64_are_doubles():
+    values = column(-1, 2**64 - 1)
+    assert values.typecode == "d"
+    assert list(values) == [-1.0, float(2**64 - 1)]
+
+
+def test_to_numpy():
+    numpy = pytest.importorskip("numpy")
+    arrays = to_numpy(interfaces({"v": 2**63}, {"id": "eth1/1"}), "If-list")
+    assert arrays["v"].dtype == numpy.uint64
+    assert arrays["v"][0] == 2**63
+    assert list(arrays["v"].mask) == [False, True]
+    assert list(arrays["id"]) == [None, "eth1/1"]
+
+
+def test_to_dataframe():
+    pytest.importorskip("pandas")
+    frame = to_dataframe(interfaces({"u": 2**63, "s": -1}, {"id": "eth1/1"}), "If-list")
+    assert str(frame["u"].dtype) == "UInt64"
+    assert str(frame["s"].dtype) == "Int64"
+    assert frame["u"][0] == 2**63
+    assert frame["s"].isna().tolist() == [False, True]
+
+
+def test_to_arrow():
+    pyarrow = pytest.importorskip("pyarrow")
+    table = to_arrow(interfaces({"v": 2**63}, {"id": "eth1/1"}), "If-list")
+    assert table.schema.field("v").type == pyarrow.uint64()
+    assert table.column("v").to_pylist() == [2**63, None]
+    assert table.column("id").to_pylist() == [None, "eth1/1"]
@@ -0,0 +1,121 @@
+"""Copyright 2019 Cisco Systems
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+"""Tests of change detection between snapshots."""
+from nxos_grpc.delta import Change, DeltaTracker
+
+
+def test_first_snapshot_is_added():
+    tracker = DeltaTracker()
+    changes = tracker.update("switch", "System", {"name": "a", "mtu": 1500})
+    assert sorted(changes) == [
+        Change("added", ("mtu",), None, 1500),
+        Change("added", ("name",), None, "a"),
+    ]
+
+
+def test_unchanged():
+    tracker = DeltaTracker()
+    tracker.update("switch", "System", {"name": "a", "items": [1, 2]})
+    assert tracker.update("switch", "System", {"items": [1, 2], "name": "a"}) == []
+
+
+def test_values_with_equal_hashes_differ():
+    # hash(-1) == hash(-2) in CPython.
+    tracker = DeltaTracker()
+    tracker.update("switch", "System", {"v": -1})
+    assert tracker.update("switch", "System", {"v": -2}) == [
+        Change("changed", ("v",), -1, -2)
+    ]
+
+
+def test_leaf_replaced_by_subtree():
+    tracker = DeltaTracker()
+    tracker.update("switch", "System", {"v": 1})
+    assert tracker.update("switch", "System", {"v": {"w": 1}}) == [
+        Change("changed", ("v",), 1, {"w": 1})
+    ]
+
+
+def test_list_entries_matched_by_key():
+    tracker = DeltaTracker()
+    tracker.update(
+        "switch",
+        "System",
+        {"If-list": [{"id": "eth1/1", "mtu": 1500}, {"id": "eth1/2", "mtu": 1500}]},
+    )
+    changes = tracker.update(
+        "switch",
+        "System",
+        {"If-list": [{"id": "eth1/2", "mtu": 9216}, {"id": "eth1/3", "mtu": 1500}]},
+    )
+    assert sorted(changes) == [
+        Change("added", ("If-list[id=eth1/3]", "id"), None, "eth1/3"),
+        Change("added", ("If-list[id=eth1/3]", "mtu"), None, 1500),
+        Change("changed", ("If-list[id=eth1/2]", "mtu"), 1500, 9216),
+        Change("removed", ("If-list[id=eth1/1]", "id"), "eth1/1", None),
+        Change("removed", ("If-list[id=eth1/1]", "mtu"), 1500, None),
+    ]
+
+
+def test_list_entries_sharing_a_key_matched_by_position():
+    tracker = DeltaTracker()
+    tracker.update(
+        "switch",
+        "Route",
+        {
+            "Route-list": [
+                {"addr": "10.0.0.1", "vrf": "a", "metric": 1},
+                {"addr": "10.0.0.1", "vrf": "b", "metric": 1},
+            ]
+        },
+    )
+    changes = tracker.update(
+        "switch",
+        "Route",
+        {
+            "Route-list": [
+                {"addr": "10.0.0.1", "vrf": "a", "metric": 2},
+                {"addr": "10.0.0.1", "vrf": "b", "metric": 1},
+            ]
+        },
+    )
+    assert changes == [Change("changed", ("Route-list[0]", "metric"), 1, 2)]
+
+
+def test_explicit_list_keys():
+    tracker = DeltaTracker(list_keys={"Route-list": ("vrf", "addr")})
+    tracker.update("switch", "Route", {"Route-list": {"addr": "10.0.0.1", "vrf": "a"}})
+    changes = tracker.update(
+        "switch", "Route", {"Route-list": {"addr": "10.0.0.1", "vrf": "b"}}
+    )
+    assert sorted(op for op, _, _, _ in changes) == ["added"] * 2 + ["removed"] * 2
+    assert changes[0].path[0] == "Route-list[vrf=b][addr=10.0.0.1]"
+
+
+def test_forget():
+    tracker = DeltaTracker()
+    tracker.update("switch", "System", {"v": 1})
+    tracker.forget("switch")
+    assert tracker.update("switch", "System", {"v": 1}) == [
+        Change("added", ("v",), None, 1)
+    ]
+
+
+def test_reordered_list_entries_unchanged():
+    tracker = DeltaTracker()
+    entries = [{"id": "eth1/%i" % index, "mtu": 1500} for index in range(3)]
+    tracker.update("switch", "System", {"If-list": entries})
+    changes = tracker.update("switch", "System", {"If-list": entries[::-1]})
+    assert changes == []
@@ -0,0 +1,45 @@
+"""Copyright 2019 Cisco Systems
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+"""Tests that lightweight imports do not load grpc or protobuf."""
+import os
+import subprocess
+import sys
+
+import pytest
+
+HEAVY_MODULES = ("grpc", "google.protobuf", "nxos_grpc.proto")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROBE = """
+import sys
+%s
+print(",".join(name for name in %r if name in sys.modules))
+"""
+
+
+@pytest.mark.parametrize(
+    "statement",
+    ["import nxos_grpc", "import nxos_grpc.response", "import nxos_grpc.xpath"],
+)
+def test_light_imports(statement):
+    # A fresh interpreter, as this one has likely imported grpc already.
+    child = subprocess.Popen(
+        [sys.executable, "-c", PROBE % (statement, HEAVY_MODULES)],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        cwd=ROOT,
+    )
+    output, error = child.communicate()
+    assert child.returncode == 0, error.decode("utf-8", "replace")
+    assert output.decode("utf-8").strip() == ""
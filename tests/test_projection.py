@@ -0,0 +1,92 @@
+"""Copyright 2019 Cisco Systems
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+"""Tests of list entry projection while decoding."""
+import json
+
+import pytest
+
+from nxos_grpc.projection import Projection, compile_fields, project
+
+ENTRIES = [
+    {
+        "id": "eth1/%i" % index,
+        "operSt": "up",
+        "mtu": 1500,
+        "rmonIfIn-items": {"ucastPkts": index, "errors": 0},
+    }
+    for index in range(3)
+]
+YANG_DATA = {
+    "System": {
+        "name": "switch",
+        "intf-items": {"phys-items": {"PhysIf-list": ENTRIES}},
+        "other": [1, {"PhysIf-list": "not a list"}],
+    }
+}
+
+
+def test_compile_fields():
+    assert compile_fields(["id", "rmonIfIn-items/ucastPkts", "a/b", "a"]) == {
+        "id": None,
+        "rmonIfIn-items": {"ucastPkts": None},
+        "a": None,
+    }
+
+
+def test_project_entry():
+    spec = compile_fields(["rmonIfIn-items/ucastPkts", "missing"])
+    assert project(ENTRIES[1], spec) == {"rmonIfIn-items": {"ucastPkts": 1}}
+
+
+@pytest.mark.parametrize("indent", [None, 2])
+def test_projects_list_entries(indent):
+    projection = Projection("PhysIf-list", ["operSt", "rmonIfIn-items/ucastPkts"])
+    yang_data = projection.loads(json.dumps(YANG_DATA, indent=indent))
+    assert yang_data["System"]["name"] == "switch"
+    assert yang_data["System"]["other"] == YANG_DATA["System"]["other"]
+    assert yang_data["System"]["intf-items"]["phys-items"]["PhysIf-list"] == [
+        {"id": entry["id"], "operSt": "up", "rmonIfIn-items": {"ucastPkts": index}}
+        for index, entry in enumerate(ENTRIES)
+    ]
+
+
+def test_projects_single_entry():
+    projection = Projection("PhysIf-list", ["mtu"])
+    yang_data = projection.loads(
+        json.dumps({"PhysIf-list": ENTRIES[0]}).encode("utf-8")
+    )
+    assert yang_data == {"PhysIf-list": {"id": "eth1/0", "mtu": 1500}}
+
+
+def test_without_list_decodes_everything():
+    projection = Projection("If-list", ["mtu"])
+    assert projection.loads(json.dumps(YANG_DATA)) == YANG_DATA
+
+
+def test_object_pairs_hook():
+    projection = Projection(
+        "PhysIf-list", ["mtu"], object_pairs_hook=lambda pairs: dict(reversed(pairs))
+    )
+    yang_data = projection.loads(json.dumps({"a": 1, "PhysIf-list": ENTRIES[:1]}))
+    assert list(yang_data) == ["PhysIf-list", "a"]
+
+
+@pytest.mark.parametrize(
+    "payload",
+    ['{"PhysIf-list": [{}] ', '{"a" 1, "PhysIf-list": []}', '{"PhysIf-list": []} x'],
+)
+def test_invalid_json(payload):
+    with pytest.raises(ValueError):
+        Projection("PhysIf-list", ["mtu"]).loads(payload)
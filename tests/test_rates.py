@@ -0,0 +1,95 @@
+"""Copyright 2019 Cisco Systems
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+"""Tests of counter rates."""
+import math
+
+import pytest
+
+from nxos_grpc.rates import CounterRates
+
+
+def interfaces(*octets):
+    return {
+        "If-list": [
+            {"id": "eth1/%i" % i, "operSt": "up", "rmon-items": {"inOctets": value}}
+            for i, value in enumerate(octets)
+        ]
+    }
+
+
+def test_rates():
+    rates = CounterRates(counters={"inOctets"})
+    first = rates.update("switch", "If", interfaces(100, "200"), timestamp=10)
+    assert first.leaves == (
+        "If-list[id=eth1/0]/rmon-items/inOctets",
+        "If-list[id=eth1/1]/rmon-items/inOctets",
+    )
+    assert all(math.isnan(value) for value in first.values)
+    assert first.elapsed is None
+    second = rates.update("switch", "If", interfaces(300, "260"), timestamp=12)
+    assert second.leaves == first.leaves
+    assert list(second.values) == [100.0, 30.0]
+    assert second.elapsed == 2
+
+
+def test_every_counter_by_default():
+    rates = CounterRates()
+    rates.update("switch", "System", {"a": 1, "b": [2, 3], "c": True}, timestamp=0)
+    sample = rates.update("switch", "System", {"a": 2, "b": [4, 6]}, timestamp=1)
+    assert sample.leaves == ("b/[0]", "b/[1]", "a")
+    assert list(sample.values) == [2.0, 3.0, 1.0]
+
+
+def test_wrap_and_reset():
+    rates = CounterRates(counters={"inOctets"}, width=32)
+    rates.update("switch", "If", interfaces(2**32 - 10, 100), timestamp=0)
+    sample = rates.update("switch", "If", interfaces(10, 5), timestamp=1)
+    assert sample.values[0] == 20.0
+    assert math.isnan(sample.values[1])
+
+
+def test_wider_values_are_not_counters():
+    rates = CounterRates(counters={"inOctets"}, width=32)
+    sample = rates.update("switch", "If", interfaces(2**32, 1), timestamp=0)
+    assert sample.leaves == ("If-list[id=eth1/1]/rmon-items/inOctets",)
+
+
+def test_layout_change():
+    rates = CounterRates(counters={"inOctets"})
+    rates.update("switch", "If", interfaces(100, 200), timestamp=0)
+    tree = interfaces(0, 300, 400)
+    del tree["If-list"][0]["rmon-items"]
+    sample = rates.update("switch", "If", tree, timestamp=1)
+    assert sample.leaves == (
+        "If-list[id=eth1/1]/rmon-items/inOctets",
+        "If-list[id=eth1/2]/rmon-items/inOctets",
+    )
+    assert sample.values[0] == 100.0
+    assert math.isnan(sample.values[1])
+
+
+def test_forget():
+    rates = CounterRates(counters={"inOctets"})
+    rates.update("switch", "If", interfaces(100), timestamp=0)
+    rates.forget("switch")
+    assert math.isnan(
+        rates.update("switch", "If", interfaces(200), timestamp=1).values[0]
+    )
+
+
+@pytest.mark.parametrize("width", [0, 65])
+def test_width_validated(width):
+    with pytest.raises(ValueError):
+        CounterRates(width=width)
@@ -0,0 +1,111 @@
+"""Copyright 2019 Cisco Systems
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+"""Tests of schema-aware typed decoding."""
+from nxos_grpc.schema import BOOL, ENUM, FLOAT, INT, TypeTable, compile_yang
+
+TYPES_MODULE = """
+module types {
+    typedef counter { type uint64; }
+    typedef octets { type types:counter; }
+    typedef loop-a { type loop-b; }
+    typedef loop-b { type loop-a; }
+}
+"""
+
+DEVICE_MODULE = """
+module device {
+    import types { prefix types; }
+    /* Comments and 'quoted' arguments are skipped. */
+    container if-items {
+        list If-list {
+            key "id";
+            leaf id { type string; }
+            leaf inOctets { type types:octets; }
+            leaf load { type decimal64 { fraction-digits 2; } }
+            leaf adminUp { type boolean; }
+            leaf operSt { type enumeration { enum up; enum down; } }
+            leaf speed { type union { type uint32; type string; } }
+            leaf looped { type loop-a; }
+            leaf mtu { type uint32; }
+            leaf-list vlans { type uint16; }
+        }
+    }
+    container sys-items {
+        // mtu is a string here, so its name is ambiguous.
+        leaf mtu { type string; }
+    }
+}
+"""
+
+
+def test_compile_yang():
+    assert compile_yang([TYPES_MODULE, DEVICE_MODULE]) == {
+        "inOctets": INT,
+        "load": FLOAT,
+        "adminUp": BOOL,
+        "operSt": ENUM,
+        "vlans": INT,
+    }
+
+
+def test_typedef_chain_needs_defining_module():
+    assert "inOctets" not in compile_yang([DEVICE_MODULE])
+
+
+def test_loads_converts_typed_leaves():
+    table = TypeTable(compile_yang([TYPES_MODULE, DEVICE_MODULE]))
+    data = table.loads(
+        '{"If-list": [{"id": "1", "inOctets": "10", "load": "0.25",'
+        ' "adminUp": "true", "operSt": "up", "speed": "100", "mtu": "9216",'
+        ' "vlans": ["1", "20"]}]}'
+    )
+    assert data == {
+        "If-list": [
+            {
+                "id": "1",
+                "inOctets": 10,
+                "load": 0.25,
+                "adminUp": True,
+                "operSt": "up",
+                "speed": "100",
+                "mtu": "9216",
+                "vlans": [1, 20],
+            }
+        ]
+    }
+
+
+def test_unparsable_values_kept():
+    table = TypeTable({"inOctets": INT, "load": FLOAT, "adminUp": BOOL})
+    assert table.loads('{"inOctets": "n/a", "load": "-", "adminUp": "yes"}') == {
+        "inOctets": "n/a",
+        "load": "-",
+        "adminUp": "yes",
+    }
+
+
+def test_dump_load_round_trip(tmp_path):
+    paths = []
+    for name, text in [("types", TYPES_MODULE), ("device", DEVICE_MODULE)]:
+        paths.append(str(tmp_path / (name + ".yang")))
+        with open(paths[-1], "w") as yang_file:
+            yang_file.write(text)
+    table = TypeTable.from_yang(paths)
+    path = str(tmp_path / "types.json")
+    table.dump(path)
+    loaded = TypeTable.load(path)
+    assert loaded.types == table.types
+    assert len(loaded) == 5
+    assert loaded.loads('{"vlans": ["3"]}') == {"vlans": [3]}
@@ -0,0 +1,92 @@
+"""Copyright 2019 Cisco Systems
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+"""Tests of batched response sinks."""
+import collections
+import io
+import json
+import threading
+import time
+
+import pytest
+
+from nxos_grpc.response import build_response
+from nxos_grpc.sinks import NDJSONSink
+
+Reply = collections.namedtuple("Reply", ["ReqID", "YangData", "Errors"])
+
+PAYLOAD = '{\n  "System": {\n    "name": "switch"\n  }\n}'
+
+
+def records(text):
+    return [json.loads(line) for line in text.splitlines()]
+
+
+@pytest.mark.parametrize("decode", [True, False])
+def test_writes_raw_yang_data(decode):
+    response = build_response(1, [Reply(1, PAYLOAD, "")], decode=decode)
+    output = io.StringIO()
+    with NDJSONSink(output) as sink:
+        sink.write(response, target="switch", path="System", timestamp=0)
+    (record,) = records(output.getvalue())
+    assert record["YangData"] == {"System": {"name": "switch"}}
+    assert record["Errors"] is None
+
+
+def test_writes_derived_yang_data():
+    response = build_response(1, [Reply(1, PAYLOAD, "")]).derive({"name": "switch"})
+    output = io.StringIO()
+    with NDJSONSink(output) as sink:
+        sink.write(response)
+    assert records(output.getvalue())[0]["YangData"] == {"name": "switch"}
+
+
+class BlockingSink(NDJSONSink):
+    """Holds up writes until released."""
+
+    def __init__(self, *args, **kwargs):
+        self.released = threading.Event()
+        super(BlockingSink, self).__init__(*args, **kwargs)
+
+    def _write_batch(self, records):
+        self.released.wait()
+        super(BlockingSink, self)._write_batch(records)
+
+
+def test_blocked_write_is_not_lost_on_close():
+    response = build_response(1, [Reply(1, PAYLOAD, "")])
+    output = io.StringIO()
+    sink = BlockingSink(output, batch_size=1, max_buffered=1, flush_interval=60)
+    errors = []
+
+    def write():
+        for _ in range(3):
+            try:
+                sink.write(response)
+            except Exception as error:  # pylint: disable=broad-except
+                errors.append(error)
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    # The first record is being written, the second buffered, and the
+    # third blocked on the full buffer.
+    time.sleep(0.2)
+    closer = threading.Thread(target=sink.close)
+    closer.start()
+    time.sleep(0.2)
+    sink.released.set()
+    closer.join(10)
+    writer.join(10)
+    assert len(records(output.getvalue())) == 2
+    assert len(errors) == 1
@@ -0,0 +1,101 @@
+"""Copyright 2019 Cisco Systems
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+"""Tests of the compressed state store."""
+import collections
+import json
+
+import pytest
+
+from nxos_grpc.response import build_response
+from nxos_grpc.state import StateStore
+
+Reply = collections.namedtuple("Reply", ["ReqID", "YangData", "Errors"])
+Client = collections.namedtuple("Client", ["target"])
+Job = collections.namedtuple("Job", ["client", "yang_path"])
+
+JOB = Job(Client("switch"), "System")
+
+
+def response(yang_data, errors="", decode=True):
+    replies = [Reply(1, json.dumps(yang_data), "")]
+    if errors:
+        replies.append(Reply(1, "", errors))
+    return build_response(1, replies, decode=decode)
+
+
+def test_put_get():
+    store = StateStore()
+    store.put("switch", "System", response({"name": "a"}, decode=False))
+    assert store.get("switch", "System") == {"name": "a"}
+    assert store.get_raw("switch", "System") == b'{"name": "a"}'
+    assert store.get("switch", "Other", default={}) == {}
+
+
+def test_put_rejects_cancelled_responses():
+    store = StateStore()
+    cancelled = response({"name": "a"})
+    cancelled.cancelled = True
+    with pytest.raises(ValueError):
+        store.put("switch", "System", cancelled)
+    assert ("switch", "System") not in store
+
+
+def test_poller_callback_skips_errors():
+    store = StateStore()
+    store.poller_callback(JOB, response({"name": "a"}), None)
+    errors = '{"errors": {"error": [{"error-tag": "data-missing"}]}}'
+    store.poller_callback(JOB, response({"name": "b"}, errors), None)
+    store.poller_callback(JOB, None, Exception("Unreachable"))
+    assert store.get("switch", "System") == {"name": "a"}
+
+
+def test_poller_callback_skips_cancelled_responses():
+    store = StateStore()
+    cancelled = response({"name": "a"})
+    cancelled.cancelled = True
+    store.poller_callback(JOB, cancelled, None)
+    assert len(store) == 0
+
+
+class PuttingDecoder(object):
+    """Decodes, putting a newer state of the same key while doing so."""
+
+    def __init__(self, store, newer):
+        self.store = store
+        self.newer = newer
+
+    def loads(self, payload):
+        newer, self.newer = self.newer, None
+        if newer is not None:
+            self.store.put("switch", "System", newer)
+        return json.loads(payload.decode("utf-8"))
+
+
+def test_get_does_not_cache_replaced_state():
+    store = StateStore()
+    store.decoder = PuttingDecoder(store, '{"name": "b"}')
+    store.put("switch", "System", '{"name": "a"}')
+    # The read in progress returns the state it started with...
+    assert store.get("switch", "System") == {"name": "a"}
+    # ...but does not cache it over the newer one.
+    assert store.get("switch", "System") == {"name": "b"}
+
+
+def test_put_invalidates_cache():
+    store = StateStore()
+    store.put("switch", "System", '{"name": "a"}')
+    assert store.get("switch", "System") == {"name": "a"}
+    store.put("switch", "System", '{"name": "b"}')
+    assert store.get("switch", "System") == {"name": "b"}
@@ -0,0 +1,133 @@
+"""Copyright 2019 Cisco Systems
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+"""Tests of XPath parsing, compilation and merging."""
+import json
+
+import pytest
+
+from nxos_grpc.xpath import (
+    Element,
+    compile_xpath,
+    merge_xpaths,
+    parse_xpath,
+    select_xpath,
+)
+
+NAMESPACE = "http://cisco.com/ns/yang/cisco-nx-os-device"
+
+
+def request(payload):
+    request = json.loads(payload)
+    assert request.pop("namespace") == NAMESPACE
+    return request
+
+
+def test_parse_elements():
+    assert parse_xpath("/System/intf-items/") == (
+        Element("System", ()),
+        Element("intf-items", ()),
+    )
+
+
+def test_parse_predicate_with_slash():
+    assert parse_xpath("System/PhysIf-list[id=eth1/1]/operSt") == (
+        Element("System", ()),
+        Element("PhysIf-list", (("id", "eth1/1"),)),
+        Element("operSt", ()),
+    )
+
+
+def test_parse_quoted_and_escaped_predicates():
+    assert parse_xpath("""Route-list[prefix='10.0.0.0/8]'][vrf="a\\"b"]""") == (
+        Element("Route-list", (("prefix", "10.0.0.0/8]"), ("vrf", 'a"b'))),
+    )
+    assert parse_xpath("a\\[b") == (Element("a[b", ()),)
+
+
+@pytest.mark.parametrize(
+    "xpath",
+    [
+        "",
+        "/",
+        "a//b",
+        "a[id=1",
+        "a[id=1]b",
+        "a[=1]",
+        "a[id]",
+        "[id=1]",
+        "a[id=1][id=2]",
+        "a]",
+        "a\\",
+        "a[id='1'x]",
+    ],
+)
+def test_parse_invalid(xpath):
+    with pytest.raises(ValueError):
+        parse_xpath(xpath)
+
+
+def test_compile_list_entry():
+    assert request(compile_xpath("System/PhysIf-list[id=eth1/1]/mtu", NAMESPACE)) == {
+        "System": {"PhysIf-list": [{"id": "eth1/1", "mtu": {}}]}
+    }
+
+
+def test_compile_requires_namespace():
+    with pytest.raises(ValueError):
+        compile_xpath("System", None)
+
+
+def test_merge_subtree_subsumes_longer_xpaths():
+    assert request(
+        merge_xpaths(
+            ["System/bgp-items/inst-items", "System/bgp-items", "System/name"],
+            NAMESPACE,
+        )
+    ) == {"System": {"bgp-items": {}, "name": {}}}
+
+
+def test_merge_list_entries():
+    assert request(
+        merge_xpaths(
+            ["System/PhysIf-list[id=eth1/1]", "System/PhysIf-list[id=eth1/2]/mtu"],
+            NAMESPACE,
+        )
+    ) == {"System": {"PhysIf-list": [{"id": "eth1/1"}, {"id": "eth1/2", "mtu": {}}]}}
+
+
+def test_merge_whole_list_subsumes_entries():
+    assert request(
+        merge_xpaths(
+            ["System/PhysIf-list[id=eth1/1]/mtu", "System/PhysIf-list"], NAMESPACE
+        )
+    ) == {"System": {"PhysIf-list": {}}}
+
+
+def test_select_splits_merged_reply():
+    reply = {
+        "System": {
+            "name": "switch",
+            "PhysIf-list": [
+                {"id": "eth1/1", "mtu": 1500, "operSt": "up"},
+                {"id": "eth1/2", "mtu": 9216, "operSt": "down"},
+            ],
+        }
+    }
+    assert select_xpath(reply, "System/name") == {"System": {"name": "switch"}}
+    assert select_xpath(reply, "System/PhysIf-list[id=eth1/2]/mtu") == {
+        "System": {"PhysIf-list": [{"id": "eth1/2", "mtu": 9216}]}
+    }
+    assert select_xpath(reply, "System/PhysIf-list[id=eth1/3]") is None
+    assert select_xpath(reply, "System/bgp-items") is None